@@ -0,0 +1,29 @@
+"""add http_etag and http_last_modified to source_configs
+
+RSS 采集条件请求（If-None-Match / If-Modified-Since）所需的响应头缓存。
+
+Revision ID: 0020_feed_http_cache
+Revises: 0019_text_to_jsonb
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0020_feed_http_cache'
+down_revision: Union[str, Sequence[str], None] = '0019_text_to_jsonb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('source_configs', sa.Column('http_etag', sa.String(), nullable=True))
+    op.add_column('source_configs', sa.Column('http_last_modified', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('source_configs', 'http_last_modified')
+    op.drop_column('source_configs', 'http_etag')
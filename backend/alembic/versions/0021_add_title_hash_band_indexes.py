@@ -0,0 +1,37 @@
+"""add SimHash band expression indexes on content_items.title_hash
+
+64 位指纹拆为 4 段 × 16 位各建表达式索引。Hamming 距离 ≤3 时至少一段完全相同，
+相似查找按段等值召回候选，不再扫描最近 5000 条。
+
+Revision ID: 0021_title_hash_bands
+Revises: 0020_feed_http_cache
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0021_title_hash_bands'
+down_revision: Union[str, Sequence[str], None] = '0020_feed_http_cache'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_BAND_EXPRS = {
+    'ix_content_title_hash_b0': '(title_hash & 65535)',
+    'ix_content_title_hash_b1': '((title_hash >> 16) & 65535)',
+    'ix_content_title_hash_b2': '((title_hash >> 32) & 65535)',
+    'ix_content_title_hash_b3': '((title_hash >> 48) & 65535)',
+}
+
+
+def upgrade() -> None:
+    for name, expr in _BAND_EXPRS.items():
+        op.create_index(name, 'content_items', [sa.text(expr)])
+
+
+def downgrade() -> None:
+    for name in _BAND_EXPRS:
+        op.drop_index(name, table_name='content_items')
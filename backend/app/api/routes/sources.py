@@ -299,6 +299,10 @@ def update_source(source_id: str, body: SourceUpdate, db: Session = Depends(get_
 
     for key, value in update_data.items():
         setattr(source, key, value)
+    # 采集地址变更后，旧的条件请求缓存头不再适用
+    if "url" in update_data or "config_json" in update_data:
+        source.http_etag = None
+        source.http_last_modified = None
 
     source.updated_at = utcnow()
     db.commit()
@@ -1,19 +1,35 @@
 """数据库连接与会话管理"""
 
 import logging
+
+import orjson
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+
+def json_serializer(obj) -> str:
+    """JSON/JSONB 列绑定参数序列化（orjson，非 str 键按 stdlib 行为转为字符串）"""
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+def json_deserializer(s: str | bytes):
+    """JSON/JSONB 列结果反序列化（由驱动在连接上注册）"""
+    return orjson.loads(s)
+
+
 engine = create_engine(
     settings.DATABASE_URL,
     pool_size=settings.DB_POOL_SIZE,
     max_overflow=settings.DB_MAX_OVERFLOW,
     pool_recycle=3600,
     pool_pre_ping=True,
+    pool_use_lifo=True,
     echo=False,
+    json_serializer=json_serializer,
+    json_deserializer=json_deserializer,
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
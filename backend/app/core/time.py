@@ -7,9 +7,20 @@ PostgreSQL 使用 TIMESTAMP WITHOUT TIME ZONE 列类型。
 规则: 全项目只用 naive UTC datetime，统一调用 utcnow()。
 """
 
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+
+_EPOCH = datetime(1970, 1, 1)
 
 
 def utcnow() -> datetime:
     """返回当前 UTC 时间（naive，不带 tzinfo）"""
     return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def utc_from_timestamp(ts: float) -> datetime:
+    """Unix 时间戳 → naive UTC datetime
+
+    等价于 datetime.fromtimestamp(ts, tz=timezone.utc).replace(tzinfo=None)，
+    但直接在 naive epoch 上加 timedelta，省去 tzinfo 构造与剥离（采集器逐条调用）。
+    """
+    return _EPOCH + timedelta(seconds=ts)
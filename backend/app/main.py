@@ -57,6 +57,10 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("Shutting down Allin-One ...")
+    from app.services.http_client import close_http_client
+    await close_http_client()
+    from app.services.enrichment import shutdown_extract_pool
+    shutdown_extract_pool()
     await proc_app.close_async()
 
 
@@ -15,7 +15,7 @@ from enum import Enum
 
 from sqlalchemy import (
     Column, String, Boolean, DateTime, Text, Integer, BigInteger,
-    ForeignKey, UniqueConstraint, Index,
+    ForeignKey, UniqueConstraint, Index, text,
 )
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
@@ -170,6 +170,10 @@ class SourceConfig(Base):
     consecutive_failures = Column(Integer, default=0)
     is_active = Column(Boolean, default=True)
 
+    # RSS 条件请求缓存（0020 迁移）
+    http_etag = Column(String, nullable=True)                    # 上次响应的 ETag
+    http_last_modified = Column(String, nullable=True)           # 上次响应的 Last-Modified
+
     created_at = Column(DateTime, default=_utcnow)
     updated_at = Column(DateTime, default=_utcnow, onupdate=_utcnow)
 
@@ -232,6 +236,11 @@ class ContentItem(Base):
     __table_args__ = (
         UniqueConstraint("source_id", "external_id", name="uq_source_external"),
         Index("ix_content_title_hash", "title_hash"),
+        # SimHash 分段表达式索引（4 × 16 位），供 dedup.find_similar_content 按段精确匹配召回候选
+        Index("ix_content_title_hash_b0", text("(title_hash & 65535)")),
+        Index("ix_content_title_hash_b1", text("((title_hash >> 16) & 65535)")),
+        Index("ix_content_title_hash_b2", text("((title_hash >> 32) & 65535)")),
+        Index("ix_content_title_hash_b3", text("((title_hash >> 48) & 65535)")),
         Index("ix_content_duplicate_of", "duplicate_of_id"),
     )
 
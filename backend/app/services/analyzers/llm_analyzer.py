@@ -1,16 +1,16 @@
-import json
 import logging
 from typing import Any, Dict, Union
 
+import orjson
 from openai import AsyncOpenAI
-from app.core.config import get_llm_config
+from app.core.config import LLMConfig, get_llm_config
 from app.models.prompt_template import PromptTemplate, OutputFormat
 
 logger = logging.getLogger(__name__)
 
 class LLMAnalyzer:
-    def __init__(self):
-        cfg = get_llm_config()
+    def __init__(self, cfg: LLMConfig | None = None):
+        cfg = cfg or get_llm_config()
         self.client = AsyncOpenAI(
             api_key=cfg.api_key,
             base_url=cfg.base_url
@@ -51,8 +51,8 @@ class LLMAnalyzer:
             # 根据格式处理返回结果
             if output_format == OutputFormat.JSON.value:
                 try:
-                    return json.loads(result_text)
-                except json.JSONDecodeError:
+                    return orjson.loads(result_text)
+                except orjson.JSONDecodeError:
                     logger.error(f"Failed to decode JSON from LLM response: {result_text}")
                     return {"error": "Invalid JSON response", "raw_content": result_text}
             else:
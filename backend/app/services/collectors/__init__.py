@@ -81,6 +81,22 @@ _USER_SUBMISSION_TYPES = {
 }
 
 
+def _commit_failed_record(db: Session, record: CollectionRecord, error_message: str | None = None) -> None:
+    """采集失败: 先回滚本次未提交的改动（已 flush 的部分条目、source 上的条件请求缓存头等），
+    再单独提交一条 failed 记录，避免失败的采集被当作成功的一部分持久化
+    """
+    source_id, started_at = record.source_id, record.started_at
+    db.rollback()
+    db.add(CollectionRecord(
+        source_id=source_id,
+        status="failed",
+        error_message=error_message,
+        started_at=started_at,
+        completed_at=utcnow(),
+    ))
+    db.commit()
+
+
 async def collect_with_retry(collector, source: SourceConfig, db: Session, config: dict) -> list[ContentItem]:
     """采集层立即重试包装
 
@@ -107,7 +123,10 @@ async def collect_with_retry(collector, source: SourceConfig, db: Session, confi
 
     for attempt in range(max_attempts):
         try:
-            return await collector.collect(source, db)
+            # 每次尝试包在 SAVEPOINT 中: 失败时回滚本次已 flush 的条目并解除会话的失败事务状态，
+            # 下一次尝试从干净状态开始，失败尝试的残留不会随后续成功一并提交
+            with db.begin_nested():
+                return await collector.collect(source, db)
         except Exception as e:
             last_exception = e
             error_type = classify_error(e)
@@ -207,11 +226,9 @@ async def collect_source_with_retry(source: SourceConfig, db: Session) -> list[C
         return new_items
 
     except Exception as e:
-        # 失败：更新记录状态，但不设置 error_message
+        # 失败：回滚本次采集的改动后提交失败记录，但不设置 error_message
         # error_message 由调度层统一设置（带错误类型前缀）
-        record.status = "failed"
-        record.completed_at = utcnow()
-        db.commit()
+        _commit_failed_record(db, record)
 
         # 根据错误类型选择日志级别
         if isinstance(e, (httpx.HTTPStatusError, httpx.ConnectError, httpx.TimeoutException)):
@@ -257,10 +274,7 @@ async def collect_source(source: SourceConfig, db: Session) -> list[ContentItem]
         return new_items
 
     except Exception as e:
-        record.status = "failed"
-        record.error_message = str(e)[:500]
-        record.completed_at = utcnow()
-        db.commit()
+        _commit_failed_record(db, record, error_message=str(e)[:500])
 
         # 暂时性网络/上游错误只记 WARNING，不打堆栈
         if isinstance(e, (httpx.HTTPStatusError, httpx.ConnectError, httpx.TimeoutException)):
@@ -46,14 +46,21 @@ def _parse_date(val) -> str | None:
 
 
 def _parse_datetime(date_str: str | None) -> datetime | None:
-    """将日期字符串解析为 UTC datetime"""
+    """将日期字符串解析为 naive UTC datetime
+
+    输入已由 _parse_date 归一化为 YYYY-MM-DD 或 YYYY-MM，按长度分派，
+    避免逐个 strptime 试格式。
+    """
     if not date_str:
         return None
-    for fmt in ("%Y-%m-%d", "%Y-%m"):
-        try:
-            return datetime.strptime(date_str, fmt)
-        except ValueError:
-            continue
+    try:
+        if len(date_str) == 10:
+            return datetime.fromisoformat(date_str)
+        if len(date_str) == 7:
+            year, month = date_str.split("-")
+            return datetime(int(year), int(month), 1)
+    except ValueError:
+        pass
     return None
 
 
@@ -119,6 +126,7 @@ class AkShareCollector(BaseCollector):
 
     async def collect(self, source: SourceConfig, db: Session) -> list[ContentItem]:
         try:
+            # 延迟导入（冷启动约 500ms），之后的调用只是 sys.modules 查找
             import akshare as ak
         except ImportError:
             logger.error("[AkShareCollector] akshare not installed, run: pip install akshare")
@@ -219,9 +227,6 @@ class AkShareCollector(BaseCollector):
             except IntegrityError:
                 pass  # (source_id, date_key) 去重
 
-        if new_count:
-            db.commit()
-
         logger.info(
             f"[AkShareCollector] {source.name}: {new_count} new / {total_rows} total rows"
         )
@@ -13,4 +13,5 @@ class BaseCollector(ABC):
 
         去重在 DB 层通过 (source_id, external_id) unique constraint 处理。
         返回成功插入的新 ContentItem 列表。
+        只 flush 不 commit: 新条目与 CollectionRecord 由 collect_source() 在同一事务中提交。
         """
@@ -3,21 +3,24 @@
 import hashlib
 import logging
 import os
-from datetime import datetime, timezone
 from pathlib import Path
 
-from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.time import utc_from_timestamp
 from app.models.content import SourceConfig, ContentItem, ContentStatus
 from app.services.collectors.base import BaseCollector
+from app.services.collectors.utils import fetch_existing_external_ids, insert_content_items
 
 logger = logging.getLogger(__name__)
 
 # 支持的文件扩展名 — 文本类可读取内容
 _TEXT_EXTENSIONS = {".txt", ".md", ".csv", ".json", ".html", ".xml", ".pdf"}
 
+# 文本内容读取上限（字符数）
+_MAX_TEXT_CHARS = 50000
+
 
 class FileUploadCollector(BaseCollector):
     """扫描上传目录，将新文件注册为 ContentItem
@@ -43,60 +46,67 @@ class FileUploadCollector(BaseCollector):
             logger.info(f"[FileUploadCollector] Created upload dir: {upload_dir}")
             return []
 
-        new_items = []
-        for file_path in upload_path.iterdir():
-            if not file_path.is_file():
-                continue
-
-            ext = file_path.suffix.lower()
-            if extensions and ext not in extensions:
-                continue
-
-            # 生成外部 ID (基于文件路径和大小)
-            stat = file_path.stat()
-            external_id = hashlib.md5(
-                f"{file_path.name}:{stat.st_size}:{stat.st_mtime}".encode()
-            ).hexdigest()
-
-            # 读取文本内容
-            raw_data = None
-            if read_text and ext in _TEXT_EXTENSIONS:
-                try:
-                    text = file_path.read_text(encoding="utf-8", errors="replace")
-                    raw_data = {
-                        "filename": file_path.name,
-                        "content": text[:50000],  # 限制 50K 字符
-                        "size": stat.st_size,
-                    }
-                except Exception as e:
-                    logger.warning(f"[FileUploadCollector] Failed to read {file_path}: {e}")
-                    raw_data = {"filename": file_path.name, "size": stat.st_size}
-            else:
-                raw_data = {
-                    "filename": file_path.name,
-                    "size": stat.st_size,
-                    "path": str(file_path),
-                }
+        existing_ids = fetch_existing_external_ids(db, source.id)
 
-            item = ContentItem(
-                source_id=source.id,
-                title=file_path.name[:500],
-                external_id=external_id,
-                url=str(file_path),
-                raw_data=raw_data,
-                status=ContentStatus.PENDING.value,
-                published_at=datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc).replace(tzinfo=None),
-            )
-            try:
-                with db.begin_nested():
-                    db.add(item)
-                    db.flush()
-                new_items.append(item)
-            except IntegrityError:
-                pass  # SAVEPOINT 已自动回滚，外层事务不受影响
+        rows = []
+        # os.scandir 的 DirEntry 自带 d_type，is_file() 无需额外 stat 系统调用
+        with os.scandir(upload_path) as it:
+            for entry in it:
+                if not entry.is_file():
+                    continue
+
+                ext = os.path.splitext(entry.name)[1].lower()
+                if extensions and ext not in extensions:
+                    continue
+
+                # 生成外部 ID (基于文件路径和大小)
+                stat = entry.stat()
+                external_id = hashlib.md5(
+                    f"{entry.name}:{stat.st_size}:{stat.st_mtime}".encode()
+                ).hexdigest()
+                if external_id in existing_ids:
+                    continue  # 已注册，跳过读取
+                existing_ids.add(external_id)
 
-        if new_items:
-            db.commit()
+                file_path = Path(entry.path)
+                rows.append(self._build_row(source, file_path, stat, external_id, ext, read_text))
+
+        new_items = insert_content_items(db, rows)
 
         logger.info(f"[FileUploadCollector] {source.name}: {len(new_items)} new files")
         return new_items
+
+    def _build_row(
+        self, source: SourceConfig, file_path: Path, stat: os.stat_result,
+        external_id: str, ext: str, read_text: bool,
+    ) -> dict:
+        """为新文件构建 ContentItem 插入行，文本类文件按需读取内容"""
+        if read_text and ext in _TEXT_EXTENSIONS:
+            try:
+                # 文本模式 read(n) 按字符计数，只解码前 50K 字符，大文件不整体载入内存
+                with open(file_path, encoding="utf-8", errors="replace") as f:
+                    text = f.read(_MAX_TEXT_CHARS)
+                raw_data = {
+                    "filename": file_path.name,
+                    "content": text,
+                    "size": stat.st_size,
+                }
+            except Exception as e:
+                logger.warning(f"[FileUploadCollector] Failed to read {file_path}: {e}")
+                raw_data = {"filename": file_path.name, "size": stat.st_size}
+        else:
+            raw_data = {
+                "filename": file_path.name,
+                "size": stat.st_size,
+                "path": str(file_path),
+            }
+
+        return {
+            "source_id": source.id,
+            "title": file_path.name[:500],
+            "external_id": external_id,
+            "url": str(file_path),
+            "raw_data": raw_data,
+            "status": ContentStatus.PENDING.value,
+            "published_at": utc_from_timestamp(stat.st_mtime),
+        }
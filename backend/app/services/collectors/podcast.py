@@ -4,6 +4,7 @@
 仅采集元数据（标题、描述、发布时间、时长、封面），不下载音频。
 """
 
+import asyncio
 import json
 import hashlib
 import logging
@@ -14,12 +15,15 @@ from email.utils import parsedate_to_datetime
 
 import feedparser
 import httpx
-from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from app.models.content import SourceConfig, ContentItem, ContentStatus, MediaItem
+from app.core.time import utc_from_timestamp
+from app.models.content import SourceConfig, ContentItem, ContentStatus
 from app.services.collectors.base import BaseCollector
-from app.services.media_detection import detect_media_for_content
+from app.services.collectors.utils import (
+    attach_detected_media, fetch_existing_external_ids, insert_content_items,
+)
+from app.services.http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -33,73 +37,64 @@ class PodcastCollector(BaseCollector):
     """Apple Podcasts 采集器"""
 
     async def collect(self, source: SourceConfig, db: Session) -> list[ContentItem]:
-        config = source.config_json or {}
+        # 拷贝一份: JSONB 列不追踪原地修改，_resolve_feed_url 回写时须赋值新对象才会被 flush
+        config = dict(source.config_json or {})
 
+        max_episodes = config.get("max_episodes", 50)
+
+        client = get_http_client()
         feed_url = config.get("feed_url")
         if not feed_url:
-            feed_url = await self._resolve_feed_url(source, config, db)
-
-        max_episodes = config.get("max_episodes", 50)
+            feed_url = await self._resolve_feed_url(client, source, config, db)
 
         logger.info(f"[PodcastCollector] Fetching {source.name}: {feed_url}")
-        raw_text = await self._fetch_feed(feed_url)
-
-        feed = feedparser.parse(raw_text)
+        resp = await self._fetch_feed(client, feed_url)
+
+        # 传原始字节 + Content-Type，由 feedparser 按 HTTP charset / XML 声明一次性判定编码，
+        # 省去 httpx 先解码成 str 再交给 feedparser 重新编码的往返。
+        # feedparser 为纯 Python 解析，大 feed 耗时可达秒级，放到默认线程池避免阻塞事件循环
+        feed = await asyncio.to_thread(
+            feedparser.parse,
+            resp.content, response_headers={"content-type": resp.headers.get("content-type", "")},
+        )
         if feed.bozo and not feed.entries:
             raise ValueError(f"Feed parse failed for '{source.name}': {feed.bozo_exception}")
 
         # 提取播客级元数据
         podcast_meta = self._extract_podcast_meta(feed.feed, config)
 
-        # 预取本源已有 URL 集合
-        existing_urls = set(
-            url for (url,) in db.query(ContentItem.url)
-            .filter(ContentItem.source_id == source.id, ContentItem.url.isnot(None))
-            .all()
-        )
+        # 预取本源已有 external_id 集合，命中即跳过（剧集 link 可能共用播客主页，不按 URL 去重）
+        existing_ids = fetch_existing_external_ids(db, source.id)
 
-        new_items = []
+        rows = []
         for entry in feed.entries[:max_episodes]:
-            url = entry.get("link")
-            if url and url in existing_urls:
+            external_id = self._extract_external_id(entry)
+            if external_id in existing_ids:
                 continue
+            existing_ids.add(external_id)
 
-            external_id = self._extract_external_id(entry)
+            url = entry.get("link")
             raw_dict = self._entry_to_dict(entry, podcast_meta)
-            item = ContentItem(
-                source_id=source.id,
-                title=entry.get("title", "Untitled")[:500],
-                external_id=external_id,
-                url=url,
-                author=entry.get("author") or feed.feed.get("author"),
-                raw_data=raw_dict,
-                status=ContentStatus.PENDING.value,
-                published_at=self._parse_published(entry),
-            )
-            try:
-                with db.begin_nested():
-                    db.add(item)
-                    db.flush()
-                    for det in detect_media_for_content(url, raw_dict):
-                        db.add(MediaItem(
-                            content_id=item.id,
-                            media_type=det.media_type,
-                            original_url=det.original_url,
-                            status="pending",
-                        ))
-                new_items.append(item)
-            except IntegrityError:
-                pass
-
-        if new_items:
-            db.commit()
+            rows.append({
+                "source_id": source.id,
+                "title": entry.get("title", "Untitled")[:500],
+                "external_id": external_id,
+                "url": url,
+                "author": entry.get("author") or feed.feed.get("author"),
+                "raw_data": raw_dict,
+                "status": ContentStatus.PENDING.value,
+                "published_at": self._parse_published(entry),
+            })
+
+        new_items = insert_content_items(db, rows)
+        attach_detected_media(db, new_items)
         logger.info(
             f"[PodcastCollector] {source.name}: {len(new_items)} new / {len(feed.entries)} total entries"
         )
         return new_items
 
     async def _resolve_feed_url(
-        self, source: SourceConfig, config: dict, db: Session
+        self, client: httpx.AsyncClient, source: SourceConfig, config: dict, db: Session
     ) -> str:
         """通过 iTunes Lookup API 解析 RSS feed URL，并缓存到 config_json"""
         podcast_id = config.get("podcast_id")
@@ -112,12 +107,11 @@ class PodcastCollector(BaseCollector):
                 )
             podcast_id = m.group(1)
 
-        async with httpx.AsyncClient(timeout=15, follow_redirects=True) as client:
-            resp = await client.get(
-                ITUNES_LOOKUP_URL, params={"id": podcast_id, "entity": "podcast"}
-            )
-            resp.raise_for_status()
-            data = resp.json()
+        resp = await client.get(
+            ITUNES_LOOKUP_URL, params={"id": podcast_id, "entity": "podcast"}, timeout=15,
+        )
+        resp.raise_for_status()
+        data = resp.json()
 
         results = data.get("results", [])
         if not results:
@@ -128,27 +122,25 @@ class PodcastCollector(BaseCollector):
         if not feed_url:
             raise ValueError(f"iTunes Lookup 返回无 feedUrl: {podcast_id}")
 
-        # 缓存到 config_json
+        # 缓存到 config_json（随采集事务一并提交）
         config["podcast_id"] = podcast_id
         config["feed_url"] = feed_url
         config["podcast_name"] = podcast_info.get("collectionName", "")
         config["artwork_url"] = podcast_info.get("artworkUrl600") or podcast_info.get("artworkUrl100", "")
         source.config_json = config
-        db.flush()
 
         logger.info(
             f"[PodcastCollector] Resolved feed for '{source.name}': {feed_url}"
         )
         return feed_url
 
-    async def _fetch_feed(self, url: str) -> str:
+    async def _fetch_feed(self, client: httpx.AsyncClient, url: str) -> httpx.Response:
         headers = {
             "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko)",
         }
-        async with httpx.AsyncClient(timeout=30, follow_redirects=True) as client:
-            resp = await client.get(url, headers=headers)
-            resp.raise_for_status()
-            return resp.text
+        resp = await client.get(url, headers=headers)
+        resp.raise_for_status()
+        return resp
 
     def _extract_podcast_meta(self, feed_info: dict, config: dict) -> dict:
         """提取播客级元数据"""
@@ -170,9 +162,7 @@ class PodcastCollector(BaseCollector):
             tp = entry.get(field)
             if tp:
                 try:
-                    return datetime.fromtimestamp(
-                        calendar.timegm(tp), tz=timezone.utc
-                    ).replace(tzinfo=None)
+                    return utc_from_timestamp(calendar.timegm(tp))
                 except Exception:
                     pass
         for field in ("published", "updated"):
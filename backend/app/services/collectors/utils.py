@@ -1,5 +1,13 @@
-"""RSS 采集器共享工具"""
-from app.models.content import SourceConfig
+"""采集器共享工具"""
+from sqlalchemy import insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.content import SourceConfig, ContentItem, MediaItem
+from app.services.media_detection import detect_media_for_content
+
+# PostgreSQL 为主库，SQLite 为本地测试 fallback（见 core/database.py）
+_DIALECT_INSERT = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
 
 
 def resolve_rss_feed_url(source: SourceConfig, rsshub_base_url: str) -> str:
@@ -35,3 +43,44 @@ def resolve_rss_feed_url(source: SourceConfig, rsshub_base_url: str) -> str:
         return source.url
     else:
         return source.url or ""
+
+
+def fetch_existing_external_ids(db: Session, source_id: str) -> set[str]:
+    """一次查询预取本源已有 external_id 集合，供采集器在 Python 侧过滤重复条目"""
+    return set(db.scalars(
+        select(ContentItem.external_id).where(ContentItem.source_id == source_id)
+    ))
+
+
+def insert_content_items(db: Session, rows: list[dict]) -> list[ContentItem]:
+    """批量插入已预过滤的 ContentItem 行，返回实际插入的 ORM 实例
+
+    单条 ORM bulk INSERT ... ON CONFLICT (source_id, external_id) DO NOTHING RETURNING:
+    SQLAlchemy 2.0 以 insertmanyvalues 一次写入 N 行并直接返回完整实例（含 Python 侧默认值）。
+    并发采集或同批次重复的条目由 DB 静默跳过，不出现在返回值中，无需 SAVEPOINT。
+    """
+    if not rows:
+        return []
+    dialect_insert = _DIALECT_INSERT[db.get_bind().dialect.name]
+    stmt = (
+        dialect_insert(ContentItem)
+        .on_conflict_do_nothing(index_elements=["source_id", "external_id"])
+        .returning(ContentItem)
+    )
+    return list(db.scalars(stmt, rows))
+
+
+def attach_detected_media(db: Session, items: list[ContentItem]) -> None:
+    """为已插入的 ContentItem 检测媒体，一条 bulk INSERT 写入 pending MediaItem（无需返回实例）"""
+    rows = [
+        {
+            "content_id": item.id,
+            "media_type": det.media_type,
+            "original_url": det.original_url,
+            "status": "pending",
+        }
+        for item in items
+        for det in detect_media_for_content(item.url, item.raw_data)
+    ]
+    if rows:
+        db.execute(insert(MediaItem), rows)
@@ -2,16 +2,16 @@
 
 import hashlib
 import logging
-from datetime import datetime
 
 import httpx
 from bs4 import BeautifulSoup
-from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.models.content import SourceConfig, ContentItem, ContentStatus
 from app.services.collectors.base import BaseCollector
+from app.services.collectors.utils import insert_content_items
+from app.services.http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -41,16 +41,19 @@ class ScraperCollector(BaseCollector):
             raise ValueError(f"No item_selector in config for source '{source.name}'")
 
         # 抓取页面
-        html = await self._fetch_page(source.url, config.get("use_browserless", False))
+        resp = await self._fetch_page(source.url, config.get("use_browserless", False))
 
-        # 解析提取
-        soup = BeautifulSoup(html, "lxml")
+        # 解析提取（列表项内的选择器预编译一次，逐项复用）。
+        # 传原始字节: 有 HTTP charset 时直接按其解码，否则由 bs4 按 BOM / <meta charset> 判定，
+        # 省去 httpx 先解码成 str 的一次整页拷贝
+        soup = BeautifulSoup(resp.content, "lxml", from_encoding=resp.charset_encoding)
         items = soup.select(item_selector)
+        selectors = self._compile_item_selectors(soup, config)
 
-        new_items = []
+        rows = []
         for idx, item_elem in enumerate(items):
             try:
-                title, link, author = self._extract_item_data(item_elem, config)
+                title, link, author = self._extract_item_data(item_elem, config, selectors)
                 if not title:
                     continue
 
@@ -59,76 +62,75 @@ class ScraperCollector(BaseCollector):
                     f"{link or source.url}/{idx}/{title}".encode()
                 ).hexdigest()
 
-                content_item = ContentItem(
-                    source_id=source.id,
-                    title=title[:500],
-                    external_id=external_id,
-                    url=link if link and link.startswith("http") else self._resolve_url(source.url, link),
-                    author=author,
-                    status=ContentStatus.PENDING.value,
-                    published_at=None,  # 网页抓取通常无时间戳
-                )
-
-                with db.begin_nested():
-                    db.add(content_item)
-                    db.flush()
-                new_items.append(content_item)
-
-            except IntegrityError:
-                pass  # SAVEPOINT 已自动回滚，外层事务不受影响
+                rows.append({
+                    "source_id": source.id,
+                    "title": title[:500],
+                    "external_id": external_id,
+                    "url": link if link and link.startswith("http") else self._resolve_url(source.url, link),
+                    "author": author,
+                    "status": ContentStatus.PENDING.value,
+                    "published_at": None,  # 网页抓取通常无时间戳
+                })
             except Exception as e:
                 logger.warning(f"[ScraperCollector] Failed to parse item: {e}")
                 continue
 
-        if new_items:
-            db.commit()
+        # 已存在的 (source_id, external_id) 由 DB 跳过，一次往返写入
+        new_items = insert_content_items(db, rows)
 
         logger.info(f"[ScraperCollector] Collected {len(new_items)} items from {source.name}")
         return new_items
 
-    async def _fetch_page(self, url: str, use_browserless: bool = False) -> str:
+    async def _fetch_page(self, url: str, use_browserless: bool = False) -> httpx.Response:
         """抓取页面 HTML — L1 HTTP 或 L2 Browserless，失败时抛异常"""
         # L1: 普通 HTTP 请求
         if not use_browserless:
             try:
-                async with httpx.AsyncClient(timeout=30, follow_redirects=True) as client:
-                    resp = await client.get(url)
-                    resp.raise_for_status()
-                    return resp.text
+                resp = await get_http_client().get(url)
+                resp.raise_for_status()
+                return resp
             except Exception as e:
                 logger.warning(f"[ScraperCollector] L1 failed for {url}: {e}, trying L2")
 
         # L2: Browserless 渲染（失败则抛异常）
         return await self._fetch_with_browserless(url, settings.BROWSERLESS_URL)
 
-    async def _fetch_with_browserless(self, url: str, browserless_url: str) -> str:
+    async def _fetch_with_browserless(self, url: str, browserless_url: str) -> httpx.Response:
         """使用 Browserless 渲染页面"""
         endpoint = f"{browserless_url.rstrip('/')}/content"
 
-        async with httpx.AsyncClient(timeout=60) as client:
-            resp = await client.post(
-                endpoint,
-                json={"url": url},
-                params={"waitFor": "networkidle0"},
-            )
-            resp.raise_for_status()
-            return resp.text
-
-    def _extract_item_data(self, item_elem, config: dict) -> tuple[str, str, str | None]:
+        resp = await get_http_client().post(
+            endpoint,
+            json={"url": url},
+            params={"waitFor": "networkidle0"},
+            timeout=60,
+        )
+        resp.raise_for_status()
+        return resp
+
+    def _compile_item_selectors(self, soup: BeautifulSoup, config: dict) -> dict:
+        """预编译列表项内的 CSS 选择器（未配置为 None），省去每个列表项 select_one 时重复的编译缓存查找"""
+        selectors = {}
+        for key, default in (("title_selector", ""), ("link_selector", "a"), ("author_selector", "")):
+            selector = config.get(key, default)
+            selectors[key] = soup.css.compile(selector) if selector else None
+        return selectors
+
+    def _extract_item_data(self, item_elem, config: dict, selectors: dict) -> tuple[str, str, str | None]:
         """从列表项元素中提取数据
 
         Returns:
             (title, link, author)
         """
-        title_selector = config.get("title_selector", "")
-        link_selector = config.get("link_selector", "a")
+        title_sel = selectors["title_selector"]
+        link_sel = selectors["link_selector"]
+        author_sel = selectors["author_selector"]
         link_attr = config.get("link_attr", "href")
-        author_selector = config.get("author_selector", "")
 
         # 提取标题
         title = ""
-        if title_selector:
-            title_elem = item_elem.select_one(title_selector)
+        if title_sel is not None:
+            title_elem = title_sel.select_one(item_elem)
             title = title_elem.get_text(strip=True) if title_elem else ""
         else:
             # 默认使用整个 item 的文本
@@ -136,14 +138,14 @@ class ScraperCollector(BaseCollector):
 
         # 提取链接
         link = ""
-        link_elem = item_elem.select_one(link_selector) if link_selector else item_elem.find("a")
+        link_elem = link_sel.select_one(item_elem) if link_sel is not None else item_elem.find("a")
         if link_elem and link_elem.has_attr(link_attr):
             link = link_elem[link_attr]
 
         # 提取作者 (可选)
         author = None
-        if author_selector:
-            author_elem = item_elem.select_one(author_selector)
+        if author_sel is not None:
+            author_elem = author_sel.select_one(item_elem)
             author = author_elem.get_text(strip=True) if author_elem else None
 
         return title, link, author
@@ -10,14 +10,16 @@
 性能:
   - 采集时一次性计算并存入 title_hash，后续比较只需位运算
   - 候选范围限定为最近 30 天 + 不同数据源，避免全表扫描
+  - 指纹 4 段 × 16 位建表达式索引，按段等值召回候选，再在 Python 侧精确计算距离
 """
 
 import hashlib
 import logging
 import re
-import struct
 from datetime import timedelta
+from functools import lru_cache
 
+from sqlalchemy import literal_column, or_
 from sqlalchemy.orm import Session
 
 from app.core.time import utcnow
@@ -26,6 +28,36 @@ logger = logging.getLogger(__name__)
 
 # Hamming 距离阈值: ≤3 表示约 95% 相似 (64 位中最多 3 位不同)
 DEFAULT_THRESHOLD = 3
+# 候选回溯天数
+DEFAULT_DAYS_LOOKBACK = 30
+
+_MASK64 = 0xFFFFFFFFFFFFFFFF
+
+# SimHash 多索引分段: 指纹拆为 4 段 × 16 位，Hamming 距离 < 段数时至少一段完全相同（抽屉原理），
+# 按段等值即可召回全部候选。SQL 表达式须与 ContentItem 上的 ix_content_title_hash_b* 索引逐字一致
+_BAND_MASK = 0xFFFF
+_TITLE_HASH_BANDS = (
+    (0, "(title_hash & 65535)"),
+    (16, "((title_hash >> 16) & 65535)"),
+    (32, "((title_hash >> 32) & 65535)"),
+    (48, "((title_hash >> 48) & 65535)"),
+)
+
+# normalize_title 的正则链，模块加载时预编译（按顺序逐步剥离，前一步的结果可能暴露下一步的前缀，不可合并）
+# 方括号/中括号标签
+_RE_BRACKET_TAG = re.compile(r'[\[【].*?[\]】]')
+# 常见转发前缀
+_RE_FORWARD_PREFIX = re.compile(r'^(转发|转载|分享|fwd)[：:\s]+')
+# 新闻源日期前缀: "XX社/汇/网X月X日[电｜丨| ]"
+_RE_DATE_PREFIX = re.compile(r'^[\w\u4e00-\u9fff]{2,6}\d{1,2}月\d{1,2}日[电｜丨|\s]*')
+# 快讯前缀: "XX快讯[，：: ]"
+_RE_FLASH_PREFIX = re.compile(r'^[\w\u4e00-\u9fff]*?快讯[，：:\s]*')
+# 括号来源后缀: （央视新闻）(新华社) 等
+_RE_PAREN_SUFFIX = re.compile(r'[（(][^）)]{1,10}[）)]\s*$')
+# 破折号来源后缀: ——新华社 等
+_RE_DASH_SUFFIX = re.compile(r'[—\-]{1,2}[\w\u4e00-\u9fff]{2,8}\s*$')
+# 标点等非 CJK / 字母数字字符
+_RE_NON_WORD = re.compile(r'[^\w\u4e00-\u9fff\u3400-\u4dbf]')
 
 
 def normalize_title(title: str) -> str:
@@ -43,27 +75,25 @@ def normalize_title(title: str) -> str:
     if not title:
         return ""
     text = title.lower().strip()
-    # 去掉方括号/中括号标签
-    text = re.sub(r'[\[【].*?[\]】]', '', text)
-    # 去掉常见转发前缀
-    text = re.sub(r'^(转发|转载|分享|fwd)[：:\s]+', '', text)
-    # 去掉新闻源日期前缀: "XX社/汇/网X月X日[电｜丨| ]"
-    text = re.sub(r'^[\w\u4e00-\u9fff]{2,6}\d{1,2}月\d{1,2}日[电｜丨|\s]*', '', text)
-    # 去掉快讯前缀: "XX快讯[，：: ]"
-    text = re.sub(r'^[\w\u4e00-\u9fff]*?快讯[，：:\s]*', '', text)
-    # 去掉括号来源后缀: （央视新闻）(新华社) 等
-    text = re.sub(r'[（(][^）)]{1,10}[）)]\s*$', '', text)
-    # 去掉破折号来源后缀: ——新华社 等
-    text = re.sub(r'[—\-]{1,2}[\w\u4e00-\u9fff]{2,8}\s*$', '', text)
-    # 去除标点，保留 CJK 和字母数字
-    text = re.sub(r'[^\w\u4e00-\u9fff\u3400-\u4dbf]', '', text)
+    text = _RE_BRACKET_TAG.sub('', text)
+    text = _RE_FORWARD_PREFIX.sub('', text)
+    text = _RE_DATE_PREFIX.sub('', text)
+    text = _RE_FLASH_PREFIX.sub('', text)
+    text = _RE_PAREN_SUFFIX.sub('', text)
+    text = _RE_DASH_SUFFIX.sub('', text)
+    text = _RE_NON_WORD.sub('', text)
     return text
 
 
+@lru_cache(maxsize=65536)
 def _token_hash(token: str) -> int:
-    """将 token 哈希为 64 位有符号整数"""
+    """将 token 哈希为 64 位无符号整数（MD5 前 8 字节，小端）
+
+    哈希函数不可更换: 已入库的 title_hash 均由此算出，换算法会使新旧指纹无法比较。
+    常见字符 3-gram 在标题间高度重复，按 token 缓存结果（约 64K 项，数 MB 内存）省去重复 MD5
+    """
     h = hashlib.md5(token.encode('utf-8')).digest()
-    return struct.unpack('<q', h[:8])[0]
+    return int.from_bytes(h[:8], 'little')
 
 
 def simhash(text: str, ngram_size: int = 3) -> int | None:
@@ -85,21 +115,17 @@ def simhash(text: str, ngram_size: int = 3) -> int | None:
     else:
         tokens = [text[i:i + ngram_size] for i in range(len(text) - ngram_size + 1)]
 
-    # 加权累加
-    v = [0] * 64
-    for token in tokens:
-        h = _token_hash(token)
-        for i in range(64):
-            if h & (1 << i):
-                v[i] += 1
-            else:
-                v[i] -= 1
-
-    # 构建指纹 (无符号)
+    # 加权累加: 第 i 位投票 v[i] = 置位数 - 未置位数 > 0 等价于 2 × 置位数 > token 数。
+    # 各 token 哈希转成 64 字符 '0'/'1' 串，zip(*) 在 C 层转置为逐位的列，
+    # 再用 tuple.count 计数，避免 64 × token 数次的 Python 层位运算
+    bit_rows = [format(_token_hash(token), '064b') for token in tokens]
+    n_tokens = len(tokens)
+
+    # 构建指纹 (无符号)；format 输出最高位在前，第 i 列对应第 63 - i 位
     fingerprint = 0
-    for i in range(64):
-        if v[i] > 0:
-            fingerprint |= (1 << i)
+    for i, column in enumerate(zip(*bit_rows)):
+        if 2 * column.count('1') > n_tokens:
+            fingerprint |= (1 << (63 - i))
 
     # 转为有符号 64 位 (PostgreSQL BIGINT 范围)
     if fingerprint >= (1 << 63):
@@ -110,27 +136,69 @@ def simhash(text: str, ngram_size: int = 3) -> int | None:
 
 def hamming_distance(h1: int, h2: int) -> int:
     """计算两个 64 位哈希的 Hamming 距离 (不同位数)"""
-    # 转为无符号进行异或
-    x = (h1 & 0xFFFFFFFFFFFFFFFF) ^ (h2 & 0xFFFFFFFFFFFFFFFF)
-    count = 0
-    while x:
-        count += 1
-        x &= x - 1
-    return count
+    # 转为无符号异或后用 C 层 popcount 计数
+    return ((h1 ^ h2) & _MASK64).bit_count()
 
 
+@lru_cache(maxsize=8192)
 def compute_title_hash(title: str) -> int | None:
-    """计算标题的 SimHash 指纹"""
+    """计算标题的 SimHash 指纹
+
+    纯函数，按标题缓存: 同批次多源转载同一标题、重复采集 / 重跑时直接命中
+    """
     normalized = normalize_title(title)
     return simhash(normalized)
 
 
+def _candidate_query(db: Session, exclude_source_id: str | None, days_lookback: int):
+    """候选查询: 有 title_hash、只和"原件"比较、不同数据源、最近 N 天，按采集时间倒序
+
+    只取 (id, title_hash) 两列，不为每个候选加载整行 ORM 对象（raw_data / processed_content 可能很大）
+    """
+    from app.models.content import ContentItem
+
+    query = db.query(ContentItem.id, ContentItem.title_hash).filter(
+        ContentItem.title_hash.isnot(None),
+        ContentItem.duplicate_of_id.is_(None),
+        ContentItem.collected_at >= utcnow() - timedelta(days=days_lookback),
+    )
+    if exclude_source_id:
+        query = query.filter(ContentItem.source_id != exclude_source_id)
+    return query.order_by(ContentItem.collected_at.desc())
+
+
+def _band_filter(hashes):
+    """任一分段与任一目标指纹的对应分段相等（走 ix_content_title_hash_b* 表达式索引）
+
+    PostgreSQL BIGINT 与 Python int 的 >> 均为算术右移，& 65535 后两侧段值一致
+    """
+    return or_(*(
+        literal_column(expr).in_(sorted({(h >> shift) & _BAND_MASK for h in hashes}))
+        for shift, expr in _TITLE_HASH_BANDS
+    ))
+
+
+def _closest(target_hash: int, candidates, threshold: int):
+    """在 (id, title_hash) 候选中找距离最近且 ≤ 阈值的一条，同距离取靠前者；返回 (id, 距离)，未命中 id 为 None"""
+    best_id = None
+    best_distance = threshold + 1
+    # 循环内联 popcount，省去逐候选的函数调用
+    for item_id, title_hash in candidates:
+        dist = ((target_hash ^ title_hash) & _MASK64).bit_count()
+        if dist < best_distance:
+            best_id = item_id
+            best_distance = dist
+            if dist == 0:
+                break  # 完全匹配，无需继续
+    return best_id, best_distance
+
+
 def find_similar_content(
     db: Session,
     title: str,
     exclude_source_id: str | None = None,
     threshold: int = DEFAULT_THRESHOLD,
-    days_lookback: int = 30,
+    days_lookback: int = DEFAULT_DAYS_LOOKBACK,
 ):
     """在已有内容中查找与给定标题相似的条目 (跨数据源)
 
@@ -150,35 +218,13 @@ def find_similar_content(
     if target_hash is None:
         return None
 
-    # 查询候选: 有 title_hash、不同数据源、最近 N 天
-    query = db.query(ContentItem).filter(
-        ContentItem.title_hash.isnot(None),
-        ContentItem.duplicate_of_id.is_(None),  # 只和"原件"比较
-    )
-    if exclude_source_id:
-        query = query.filter(ContentItem.source_id != exclude_source_id)
+    query = _candidate_query(db, exclude_source_id, days_lookback)
+    if threshold < len(_TITLE_HASH_BANDS):
+        # 按段召回，候选从最近 5000 条缩小到少数段命中的条目
+        query = query.filter(_band_filter([target_hash]))
 
-    cutoff = utcnow() - timedelta(days=days_lookback)
-    candidates = (
-        query
-        .filter(ContentItem.collected_at >= cutoff)
-        .order_by(ContentItem.collected_at.desc())
-        .limit(5000)
-        .all()
-    )
-
-    best_match = None
-    best_distance = threshold + 1
-
-    for item in candidates:
-        dist = hamming_distance(target_hash, item.title_hash)
-        if dist <= threshold and dist < best_distance:
-            best_match = item
-            best_distance = dist
-            if dist == 0:
-                break  # 完全匹配，无需继续
-
-    return best_match
+    best_id, _ = _closest(target_hash, query.limit(5000).all(), threshold)
+    return db.get(ContentItem, best_id) if best_id else None
 
 
 def check_and_mark_duplicates(
@@ -189,10 +235,10 @@ def check_and_mark_duplicates(
 ) -> int:
     """批量检查新内容的标题相似度，标记跨源重复
 
-    在采集任务完成后调用，为每条新内容:
-    1. 计算并保存 title_hash
-    2. 跨源查找相似内容
-    3. 找到时设置 duplicate_of_id
+    在采集任务完成后调用:
+    1. 为每条新内容计算并保存 title_hash
+    2. 一次查询按段召回整批的跨源候选
+    3. 逐条在候选中找最近指纹，命中时设置 duplicate_of_id
 
     Args:
         db: 数据库会话
@@ -206,29 +252,31 @@ def check_and_mark_duplicates(
     if not new_items:
         return 0
 
-    duplicates_found = 0
-
+    hashed_items = []
     for item in new_items:
-        # 1. 计算标题哈希
         item.title_hash = compute_title_hash(item.title)
+        if item.title_hash is not None:
+            hashed_items.append(item)
+    if not hashed_items:
+        return 0
 
-        if item.title_hash is None:
-            continue
+    # 整批一次查询，取代逐条 find_similar_content 的 N 次往返
+    query = _candidate_query(db, source_id, DEFAULT_DAYS_LOOKBACK)
+    if threshold < len(_TITLE_HASH_BANDS):
+        candidates = query.filter(_band_filter([item.title_hash for item in hashed_items])).all()
+    else:
+        candidates = query.limit(5000).all()
 
-        # 2. 查找跨源相似内容
-        similar = find_similar_content(
-            db, item.title,
-            exclude_source_id=source_id,
-            threshold=threshold,
-        )
+    duplicates_found = 0
+    batch_ids = {item.id for item in hashed_items}
+    candidates = [c for c in candidates if c[0] not in batch_ids]  # 未排除来源时不与本批自身比较
 
-        if similar:
-            item.duplicate_of_id = similar.id
+    for item in hashed_items:
+        best_id, distance = _closest(item.title_hash, candidates, threshold)
+        if best_id:
+            item.duplicate_of_id = best_id
             duplicates_found += 1
-            logger.info(
-                f"[dedup] 发现相似内容: '{item.title[:40]}' ↔ '{similar.title[:40]}' "
-                f"(distance={hamming_distance(item.title_hash, similar.title_hash)})"
-            )
+            logger.info(f"[dedup] 发现相似内容: '{item.title[:40]}' ↔ {best_id} (distance={distance})")
 
     if duplicates_found > 0:
         db.flush()
@@ -1,18 +1,33 @@
 """电子书元数据解析服务
 
-支持 EPUB (ebooklib) 和 MOBI (mobi 库) 格式。
+支持 EPUB (zip 直读，ebooklib 回退) 和 MOBI (mobi 库) 格式。
 提取: 标题、作者、语言、出版商、描述、封面图、目录。
 """
 
 import logging
 import os
+import posixpath
 import shutil
 import tempfile
 from dataclasses import dataclass, field
 from pathlib import Path
+from urllib.parse import unquote
 
 logger = logging.getLogger(__name__)
 
+_CONTAINER_NS = "urn:oasis:names:tc:opendocument:xmlns:container"
+_OPF_NS = "http://www.idpf.org/2007/opf"
+_NCX_NS = "http://www.daisy.org/z3986/2005/ncx/"
+_DC_NS = "{http://purl.org/dc/elements/1.1/}"
+# OPF 中 Dublin Core 元素 → EbookMetadata 字段
+_OPF_DC_FIELDS = {
+    f"{_DC_NS}title": "title",
+    f"{_DC_NS}creator": "author",
+    f"{_DC_NS}language": "language",
+    f"{_DC_NS}publisher": "publisher",
+    f"{_DC_NS}description": "description",
+}
+
 
 @dataclass
 class TocItem:
@@ -45,7 +60,141 @@ class EbookMetadata:
 
 
 def parse_epub(file_path: str) -> EbookMetadata:
-    """使用 ebooklib 解析 EPUB 元数据"""
+    """解析 EPUB 元数据
+
+    EPUB 即 zip 包: 直接按 container.xml → OPF 读取元数据、封面和目录，只解压用到的几个条目。
+    ebooklib.read_epub 会读入全部 manifest 条目（整本书的章节/图片）并逐个构建对象，
+    仅作为 zip 直读失败（结构不规范等）时的回退
+    """
+    try:
+        return _parse_epub_zip(file_path)
+    except Exception as e:
+        logger.debug(f"EPUB zip parsing failed for {file_path}, falling back to ebooklib: {e}")
+        return _parse_epub_ebooklib(file_path)
+
+
+def _parse_epub_zip(file_path: str) -> EbookMetadata:
+    """zip 直读 EPUB: 元数据取 <metadata> 下各 DC 字段首个元素，目录优先 NCX、其次 EPUB3 nav"""
+    import zipfile
+    from lxml import etree
+
+    meta = EbookMetadata()
+    with zipfile.ZipFile(file_path) as zf:
+        container = etree.fromstring(zf.read("META-INF/container.xml"))
+        opf_path = container.find(f".//{{{_CONTAINER_NS}}}rootfile").get("full-path")
+        opf_dir = posixpath.dirname(opf_path)
+        opf = etree.fromstring(zf.read(opf_path))
+
+        # 元数据
+        metadata = opf.find(f"{{{_OPF_NS}}}metadata")
+        cover_id = None
+        seen = set()
+        for el in metadata:
+            if el.tag == f"{{{_OPF_NS}}}meta":
+                if cover_id is None and el.get("name") == "cover":
+                    cover_id = el.get("content")
+                continue
+            field_name = _OPF_DC_FIELDS.get(el.tag)
+            if field_name and field_name not in seen:
+                seen.add(field_name)
+                if el.text:
+                    setattr(meta, field_name, el.text)
+
+        # manifest: id → (zip 内路径, media-type, properties)
+        manifest = {}
+        for item in opf.find(f"{{{_OPF_NS}}}manifest").iter(f"{{{_OPF_NS}}}item"):
+            href = item.get("href")
+            if href:
+                path = posixpath.normpath(posixpath.join(opf_dir, unquote(href)))
+                manifest[item.get("id")] = (path, item.get("media-type") or "", item.get("properties") or "")
+
+        meta.cover_data, meta.cover_ext = _extract_epub_cover_zip(zf, manifest, cover_id)
+
+        # 目录: spine@toc 指向的 NCX，否则 properties 含 nav 的 XHTML
+        spine = opf.find(f"{{{_OPF_NS}}}spine")
+        ncx_id = spine.get("toc") if spine is not None else None
+        if ncx_id and ncx_id in manifest:
+            meta.toc = _parse_ncx_toc(etree.fromstring(zf.read(manifest[ncx_id][0])))
+        if not meta.toc:
+            nav_path = next(
+                (path for path, _mt, props in manifest.values() if "nav" in props.split()), None,
+            )
+            if nav_path:
+                meta.toc = _parse_nav_toc(zf.read(nav_path), nav_path, opf_dir)
+
+    return meta
+
+
+def _extract_epub_cover_zip(zf, manifest: dict, cover_id: str | None) -> tuple[bytes | None, str | None]:
+    """从 zip 中读取封面图，查找顺序同 _extract_epub_cover"""
+    images = [(item_id, path, mt) for item_id, (path, mt, _props) in manifest.items() if mt.startswith("image/")]
+
+    # 方法 1: OPF <meta name="cover" content="..."/> 指向的 manifest 条目
+    if cover_id and cover_id in manifest:
+        path, media_type, _props = manifest[cover_id]
+        return zf.read(path), _mime_to_ext(media_type)
+
+    # 方法 2: 查找 id 或文件名含 cover 的图片
+    for item_id, path, media_type in images:
+        if "cover" in (item_id or "").lower() or "cover" in path.lower():
+            return zf.read(path), _mime_to_ext(media_type)
+
+    # 方法 3: 取第一张图片
+    if images:
+        _item_id, path, media_type = images[0]
+        return zf.read(path), _mime_to_ext(media_type)
+
+    return None, None
+
+
+def _parse_ncx_toc(ncx_root) -> list[TocItem]:
+    """解析 NCX navMap；href 保持 content@src 原值（同 ebooklib）"""
+    def parse_points(parent) -> list[TocItem]:
+        items = []
+        for point in parent.iterchildren(f"{{{_NCX_NS}}}navPoint"):
+            label = point.find(f"{{{_NCX_NS}}}navLabel")
+            content = point.find(f"{{{_NCX_NS}}}content")
+            items.append(TocItem(
+                title=(label[0].text if label is not None and len(label) else "") or "",
+                href=content.get("src") if content is not None else None,
+                children=parse_points(point),
+            ))
+        return items
+
+    nav_map = ncx_root.find(f"{{{_NCX_NS}}}navMap")
+    return parse_points(nav_map) if nav_map is not None else []
+
+
+def _parse_nav_toc(data: bytes, nav_path: str, opf_dir: str) -> list[TocItem]:
+    """解析 EPUB3 nav 文档的 toc 列表；href 转为相对 OPF 目录的路径（同 ebooklib）"""
+    import lxml.html
+
+    doc = lxml.html.document_fromstring(data)
+    nav_nodes = doc.xpath("//nav[@*='toc']")
+    if not nav_nodes:
+        return []
+    base_path = posixpath.relpath(posixpath.dirname(nav_path), opf_dir or ".")
+
+    def parse_list(list_node) -> list[TocItem]:
+        items = []
+        for li in list_node.findall("li"):
+            sublist = li.find("ol")
+            link = li.find("a")
+            href = link.get("href") if link is not None else None
+            if href:
+                href = posixpath.normpath(posixpath.join(base_path, href))
+            if sublist is not None:
+                items.append(TocItem(title=li[0].text_content(), href=href, children=parse_list(sublist)))
+            elif href:
+                items.append(TocItem(title=link.text_content(), href=href))
+        return items
+
+    ol = nav_nodes[0].find("ol")
+    return parse_list(ol) if ol is not None else []
+
+
+def _parse_epub_ebooklib(file_path: str) -> EbookMetadata:
+    """使用 ebooklib 解析 EPUB 元数据（zip 直读失败时的回退）"""
     from ebooklib import epub
 
     book = epub.read_epub(file_path, options={"ignore_ncx": False})
@@ -197,36 +346,24 @@ def parse_mobi(file_path: str) -> EbookMetadata:
 
 
 def _parse_opf_metadata(opf_path: Path, meta: EbookMetadata):
-    """从 OPF XML 中提取元数据"""
+    """从 OPF XML 中提取元数据
+
+    iterparse 单次流式遍历，按标签分发到字段；每个字段只取首个元素（同 find 语义），
+    <metadata> 在 <manifest>/<spine> 之前，字段取齐即停止解析
+    """
     try:
         import xml.etree.ElementTree as ET
-        tree = ET.parse(opf_path)
-        root = tree.getroot()
-
-        ns = {
-            "dc": "http://purl.org/dc/elements/1.1/",
-            "opf": "http://www.idpf.org/2007/opf",
-        }
-
-        title_el = root.find(".//dc:title", ns)
-        if title_el is not None and title_el.text:
-            meta.title = title_el.text
-
-        creator_el = root.find(".//dc:creator", ns)
-        if creator_el is not None and creator_el.text:
-            meta.author = creator_el.text
-
-        lang_el = root.find(".//dc:language", ns)
-        if lang_el is not None and lang_el.text:
-            meta.language = lang_el.text
-
-        publisher_el = root.find(".//dc:publisher", ns)
-        if publisher_el is not None and publisher_el.text:
-            meta.publisher = publisher_el.text
 
-        desc_el = root.find(".//dc:description", ns)
-        if desc_el is not None and desc_el.text:
-            meta.description = desc_el.text
+        seen = set()
+        for _event, el in ET.iterparse(opf_path, events=("end",)):
+            field_name = _OPF_DC_FIELDS.get(el.tag)
+            if field_name and field_name not in seen:
+                seen.add(field_name)
+                if el.text:
+                    setattr(meta, field_name, el.text)
+                if len(seen) == len(_OPF_DC_FIELDS):
+                    break
+            el.clear()
 
     except Exception as e:
         logger.debug(f"OPF parsing failed: {e}")
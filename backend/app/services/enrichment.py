@@ -8,31 +8,47 @@
 
 import asyncio
 import logging
+import multiprocessing
+import os
 import re
 import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import httpx
+import lxml.html
+from bs4 import BeautifulSoup
+from lxml import etree
+
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
 # ============ 常量 ============
 
-_LAZY_ATTRS = ["data-src", "data-original", "data-lazy-src", "data-lazy", "data-echo", "data-url"]
+_LAZY_ATTRS = ("data-src", "data-original", "data-lazy-src", "data-lazy", "data-echo", "data-url")
+# _fix_lazy_images 可能改写的前提: 有懒加载属性、srcset 或 <noscript>，都不出现则跳过解析
+# （"data-lazy" 同时覆盖 "data-lazy-src"；属性名大小写不敏感，匹配前整体 lower()）
+_LAZY_HTML_NEEDLES = ("data-src", "data-original", "data-lazy", "data-echo", "data-url", "srcset", "<noscript")
 _PLACEHOLDER_PATTERNS = re.compile(
     r"data:image/|placeholder|spacer|blank\.(gif|png)|1x1|loading.*\.(gif|png|svg)", re.I
 )
 
+# 按优先级排列，首个命中即为原因。模式均为小写、不带 re.I: 调用方先对文本整体 lower() 一次，
+# 再做大小写敏感匹配（re.I 逐字符折叠大小写且无法走字面量前缀快速跳过，慢数倍）
 _BLOCKED_PAGE_PATTERNS = [
     # Cloudflare
-    (re.compile(r"cf-browser-verification|cf-challenge|checking your browser", re.I), "cloudflare_challenge"),
-    (re.compile(r"ray\s*id|cloudflare", re.I), "cloudflare_block"),
+    (re.compile(r"cf-browser-verification|cf-challenge|checking your browser"), "cloudflare_challenge"),
+    (re.compile(r"ray\s*id|cloudflare"), "cloudflare_block"),
     # HTTP 错误页
-    (re.compile(r"403\s*forbidden|access\s*denied|you don'?t have permission", re.I), "403_forbidden"),
-    (re.compile(r"401\s*unauthorized", re.I), "401_unauthorized"),
+    (re.compile(r"403\s*forbidden|access\s*denied|you don'?t have permission"), "403_forbidden"),
+    (re.compile(r"401\s*unauthorized"), "401_unauthorized"),
     # 验证码 / 人机验证
-    (re.compile(r"captcha|recaptcha|hcaptcha|verify you are human|are you a robot", re.I), "captcha"),
+    (re.compile(r"captcha|recaptcha|hcaptcha|verify you are human|are you a robot"), "captcha"),
     # 付费墙
-    (re.compile(r"subscribe to (read|continue|access)|paywall|premium content|sign in to read", re.I), "paywall"),
+    (re.compile(r"subscribe to (read|continue|access)|paywall|premium content|sign in to read"), "paywall"),
     # 通用拦截
-    (re.compile(r"please enable (javascript|cookies)|browser.*not supported", re.I), "browser_requirement"),
+    (re.compile(r"please enable (javascript|cookies)|browser.*not supported"), "browser_requirement"),
 ]
 
 
@@ -59,12 +75,24 @@ def _parse_srcset_best(srcset: str) -> str | None:
 
 
 def _fix_lazy_images(html: str) -> str:
-    """在正文提取前，将懒加载图片的真实 URL 写入 src"""
-    from bs4 import BeautifulSoup
+    """在正文提取前，将懒加载图片的真实 URL 写入 src
+
+    直接在 lxml 树上遍历改写（BeautifulSoup 的 lxml 后端底层即同一 libxml2 解析器，
+    省去逐节点构建 Python 代理对象的开销）。统一以 UTF-8 字节解析，
+    避免带 <?xml encoding?> 声明的 str 被 lxml 拒绝
+    """
+    html_lower = html.lower()
+    if not any(needle in html_lower for needle in _LAZY_HTML_NEEDLES):
+        return html
 
-    soup = BeautifulSoup(html, "lxml")
+    try:
+        doc = lxml.html.document_fromstring(
+            html.encode("utf-8"), parser=lxml.html.HTMLParser(encoding="utf-8"),
+        )
+    except etree.ParserError:
+        return html  # 空文档
 
-    for img in soup.find_all("img"):
+    for img in doc.iter("img"):
         src = img.get("src", "")
         is_placeholder = not src or _PLACEHOLDER_PATTERNS.search(src)
 
@@ -72,7 +100,7 @@ def _fix_lazy_images(html: str) -> str:
             for attr in _LAZY_ATTRS:
                 val = img.get(attr, "")
                 if val and val.startswith("http"):
-                    img["src"] = val
+                    img.set("src", val)
                     break
 
             if not img.get("src") or _PLACEHOLDER_PATTERNS.search(img.get("src", "")):
@@ -80,21 +108,23 @@ def _fix_lazy_images(html: str) -> str:
                 if srcset:
                     best = _parse_srcset_best(srcset)
                     if best:
-                        img["src"] = best
+                        img.set("src", best)
 
-    for noscript in soup.find_all("noscript"):
-        noscript_img = noscript.find("img")
-        if noscript_img and noscript_img.get("src"):
-            prev = noscript.find_previous_sibling("img")
-            if prev:
-                prev["src"] = noscript_img["src"]
-                noscript.decompose()
+    # 先收集再改树，避免边遍历边删除
+    for noscript in list(doc.iter("noscript")):
+        noscript_img = next(noscript.iter("img"), None)
+        if noscript_img is not None and noscript_img.get("src"):
+            prev = next(noscript.itersiblings("img", preceding=True), None)
+            if prev is not None:
+                prev.set("src", noscript_img.get("src"))
+                noscript.drop_tree()  # 保留尾随文本
 
-    return str(soup)
+    return lxml.html.tostring(doc, encoding="unicode")
 
 
 def _extract_with_trafilatura(html: str, url: str | None = None) -> str | None:
     """用 trafilatura 提取正文，输出 Markdown"""
+    # 保持惰性导入: trafilatura 的可选依赖（如 lxml_html_clean）缺失时，只影响提取路径而不拖垮本模块的所有导入方
     import trafilatura
 
     html = _fix_lazy_images(html)
@@ -119,8 +149,10 @@ def _detect_anti_scraping(html: str, plain_text: str) -> str | None:
     if len(plain_text.strip()) < 50:
         return "content_too_short"
 
+    html_lower = html.lower()
+    text_lower = plain_text.lower()
     for pattern, reason in _BLOCKED_PAGE_PATTERNS:
-        if pattern.search(html) or pattern.search(plain_text):
+        if pattern.search(html_lower) or pattern.search(text_lower):
             return reason
 
     return None
@@ -154,8 +186,6 @@ def _compare_quality(enriched_text: str, original_text: str) -> dict:
 
 def _fetch_with_browserless(url: str, browserless_url: str, timeout: int = 60) -> str:
     """使用 Browserless 渲染 JS 页面，返回原始 HTML（由调用方统一提取）"""
-    import httpx
-
     endpoint = f"{browserless_url.rstrip('/')}/content"
 
     with httpx.Client(timeout=timeout) as client:
@@ -171,13 +201,12 @@ def _fetch_with_browserless(url: str, browserless_url: str, timeout: int = 60) -
 async def _extract_with_crawl4ai(url: str) -> str | None:
     """用 Crawl4AI 提取网页正文，通过 CDP 连接 Browserless，返回 fit_markdown"""
     try:
+        # 保持惰性导入: crawl4ai 依赖 playwright 等重型包，提取子进程也会导入本模块，不应随之加载
         from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig
     except ImportError:
         logger.warning("[crawl4ai] crawl4ai not installed, skipping")
         return None
 
-    from app.core.config import settings
-
     browser_config = BrowserConfig(cdp_url=settings.CRAWL4AI_CDP_URL)
     run_config = CrawlerRunConfig(
         word_count_threshold=100,
@@ -213,11 +242,41 @@ async def _extract_with_crawl4ai(url: str) -> str | None:
 
 # ============ 异步封装（用于 API 端点并行调用） ============
 
+# trafilatura 解析长时间持有 GIL，放默认线程池时 enrich_compare 的多路提取实际串行，
+# 改用独立进程池并行；惰性创建，spawn 启动避免 fork 带上 API 进程的线程与事件循环状态
+_extract_pool: ProcessPoolExecutor | None = None
+
+
+def _get_extract_pool() -> ProcessPoolExecutor:
+    """返回 trafilatura 提取进程池，不存在时惰性创建"""
+    global _extract_pool
+    if _extract_pool is None:
+        _extract_pool = ProcessPoolExecutor(
+            max_workers=max(2, (os.cpu_count() or 2) // 2),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _extract_pool
+
+
+def shutdown_extract_pool() -> None:
+    """关闭提取进程池（进程退出时调用）"""
+    global _extract_pool
+    if _extract_pool is not None:
+        _extract_pool.shutdown(wait=False, cancel_futures=True)
+        _extract_pool = None
+
+
+async def _extract_in_pool(html: str, url: str) -> str | None:
+    """在进程池中执行 _extract_with_trafilatura"""
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(_get_extract_pool(), _extract_with_trafilatura, html, url)
+    except BrokenProcessPool:
+        shutdown_extract_pool()  # 子进程异常退出后池不可再用，下次调用重建
+        raise
+
 async def fetch_l1_http(url: str) -> tuple[str | None, str | None]:
     """L1: async httpx GET -> trafilatura -> (markdown, error)"""
-    import httpx
-    from bs4 import BeautifulSoup
-
     try:
         async with httpx.AsyncClient(timeout=30, follow_redirects=True) as client:
             resp = await client.get(url)
@@ -231,8 +290,7 @@ async def fetch_l1_http(url: str) -> tuple[str | None, str | None]:
         if block_reason:
             return None, f"anti-scraping detected: {block_reason}"
 
-        loop = asyncio.get_running_loop()
-        result = await loop.run_in_executor(None, _extract_with_trafilatura, html, url)
+        result = await _extract_in_pool(html, url)
 
         if result and len(result.strip()) >= 100:
             return result, None
@@ -256,10 +314,6 @@ async def fetch_crawl4ai(url: str) -> tuple[str | None, str | None]:
 
 async def fetch_l3_browserless(url: str) -> tuple[str | None, str | None]:
     """L3: async httpx POST to Browserless -> trafilatura -> (markdown, error)"""
-    import httpx
-    from bs4 import BeautifulSoup
-    from app.core.config import settings
-
     try:
         endpoint = f"{settings.BROWSERLESS_URL.rstrip('/')}/content"
         async with httpx.AsyncClient(timeout=60) as client:
@@ -278,8 +332,7 @@ async def fetch_l3_browserless(url: str) -> tuple[str | None, str | None]:
         if block_reason:
             return None, f"anti-scraping detected: {block_reason}"
 
-        loop = asyncio.get_running_loop()
-        result = await loop.run_in_executor(None, _extract_with_trafilatura, html, url)
+        result = await _extract_in_pool(html, url)
 
         if result and len(result.strip()) >= 100:
             return result, None
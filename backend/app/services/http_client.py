@@ -0,0 +1,40 @@
+"""共享 httpx.AsyncClient — 采集器跨调用复用连接池
+
+Worker 长期运行同一个事件循环，每次采集新建 client 会重复 TCP + TLS 握手。
+此处按事件循环缓存一个 client（httpx 连接绑定创建时的 loop，不能跨 loop 复用），
+调用方直接使用，不要 `async with` 或手动关闭。
+client 不保存响应 cookie；需要会话 cookie 的调用方应按请求显式传入。
+"""
+
+import asyncio
+import http.cookiejar
+import weakref
+
+import httpx
+
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """返回当前事件循环的共享 client（默认 timeout=30、跟随重定向），不存在时惰性创建"""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            timeout=30,
+            follow_redirects=True,
+            # 不保存任何 Set-Cookie: 各数据源 / 账号共用此 client，持久 cookie 会串到同域的其他源
+            cookies=http.cookiejar.CookieJar(policy=http.cookiejar.DefaultCookiePolicy(allowed_domains=[])),
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+        )
+        _clients[loop] = client
+    return client
+
+
+async def close_http_client() -> None:
+    """关闭当前事件循环的共享 client（进程退出时调用）"""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
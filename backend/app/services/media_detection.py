@@ -6,17 +6,18 @@
 3. RSS media:content (medium/type 字段)
 """
 
-import re
 from dataclasses import dataclass
 
-VIDEO_URL_PATTERNS = [
-    r'bilibili\.com/video/',
-    r'youtube\.com/watch',
-    r'youtu\.be/',
-    r'b23\.tv/',
-]
+# 均为字面子串，逐个 `in` 判断（C 层子串搜索）比正则交替更快，未命中的常见情况也无需进正则引擎
+VIDEO_URL_PATTERNS = (
+    'bilibili.com/video/',
+    'youtube.com/watch',
+    'youtu.be/',
+    'b23.tv/',
+)
 
-_VIDEO_URL_RE = re.compile('|'.join(VIDEO_URL_PATTERNS))
+# enclosure / media:content 的 MIME 主类型 → 媒体类型
+_MEDIA_KIND_BY_MIME_MAJOR = {"video": "video", "audio": "audio"}
 
 
 @dataclass
@@ -28,7 +29,12 @@ class DetectedMedia:
 
 def url_matches_video_pattern(url: str) -> bool:
     """URL 是否匹配已知视频平台模式"""
-    return bool(url and _VIDEO_URL_RE.search(url))
+    if not url:
+        return False
+    for pattern in VIDEO_URL_PATTERNS:
+        if pattern in url:
+            return True
+    return False
 
 
 def detect_media_from_url(url: str) -> list[DetectedMedia]:
@@ -38,6 +44,12 @@ def detect_media_from_url(url: str) -> list[DetectedMedia]:
     return []
 
 
+def _kind_from_mime(mime_type: str) -> str | None:
+    """MIME 主类型 → 媒体类型（"video/mp4" → "video"），非音视频返回 None"""
+    major, sep, _ = mime_type.partition("/")
+    return _MEDIA_KIND_BY_MIME_MAJOR.get(major) if sep else None
+
+
 def detect_media_from_raw_data(raw_dict: dict) -> list[DetectedMedia]:
     """从 RSS raw_data 的 enclosures 和 media_content 检测媒体"""
     results: list[DetectedMedia] = []
@@ -48,12 +60,9 @@ def detect_media_from_raw_data(raw_dict: dict) -> list[DetectedMedia]:
         href = enc.get("href")
         if not href or href in seen_urls:
             continue
-        enc_type = (enc.get("type") or "").lower()
-        if enc_type.startswith("video/"):
-            results.append(DetectedMedia(media_type="video", original_url=href, detection_source="enclosure"))
-            seen_urls.add(href)
-        elif enc_type.startswith("audio/"):
-            results.append(DetectedMedia(media_type="audio", original_url=href, detection_source="enclosure"))
+        kind = _kind_from_mime((enc.get("type") or "").lower())
+        if kind:
+            results.append(DetectedMedia(media_type=kind, original_url=href, detection_source="enclosure"))
             seen_urls.add(href)
 
     # media_content: [{"url": "...", "medium": "video", "type": "video/mp4"}]
@@ -62,13 +71,16 @@ def detect_media_from_raw_data(raw_dict: dict) -> list[DetectedMedia]:
         if not mc_url or mc_url in seen_urls:
             continue
         medium = (mc.get("medium") or "").lower()
-        mc_type = (mc.get("type") or "").lower()
-        if medium == "video" or mc_type.startswith("video/"):
-            results.append(DetectedMedia(media_type="video", original_url=mc_url, detection_source="media_content"))
-            seen_urls.add(mc_url)
-        elif medium == "audio" or mc_type.startswith("audio/"):
-            results.append(DetectedMedia(media_type="audio", original_url=mc_url, detection_source="media_content"))
-            seen_urls.add(mc_url)
+        type_kind = _kind_from_mime((mc.get("type") or "").lower())
+        # medium 或 type 任一为视频即视为视频，优先于音频
+        if medium == "video" or type_kind == "video":
+            kind = "video"
+        elif medium == "audio" or type_kind == "audio":
+            kind = "audio"
+        else:
+            continue
+        results.append(DetectedMedia(media_type=kind, original_url=mc_url, detection_source="media_content"))
+        seen_urls.add(mc_url)
 
     return results
 
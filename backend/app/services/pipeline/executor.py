@@ -6,8 +6,11 @@ context 中 content_id 总是存在的。
 
 import logging
 
+from sqlalchemy import select, update
+
 from app.core.database import SessionLocal
 from app.core.time import utcnow
+from app.models.content import ContentItem, ContentStatus
 from app.models.pipeline import (
     PipelineExecution, PipelineStep,
     PipelineStatus, StepStatus,
@@ -18,9 +21,12 @@ logger = logging.getLogger(__name__)
 
 class PipelineExecutor:
 
-    def prepare_step(self, execution_id: str, step_index: int) -> dict:
+    def prepare_step(self, execution_id: str, step_index: int, previous_steps: dict | None = None) -> dict:
         """标记步骤为运行中并返回执行上下文（单事务）
 
+        previous_steps: 调用方已持有的之前步骤输出（内联循环逐步累积），
+        传入时只取当前步骤，不再每步重新读回全部之前步骤的 output_data
+
         返回:
         - content_id: 被处理的内容 (必有)
         - source_id: 来源
@@ -28,53 +34,67 @@ class PipelineExecutor:
         - previous_steps: 之前步骤的 output_data
         """
         with SessionLocal() as db:
-            execution = db.get(PipelineExecution, execution_id)
-            if not execution:
+            # execution 与 content 的 url / title 一次 JOIN 取回（content 可能已删除，用外连接）
+            row = db.execute(
+                select(PipelineExecution, ContentItem.url, ContentItem.title)
+                .outerjoin(ContentItem, ContentItem.id == PipelineExecution.content_id)
+                .where(PipelineExecution.id == execution_id)
+            ).first()
+            if not row:
                 raise ValueError(f"Execution not found: {execution_id}")
+            execution, content_url, content_title = row
 
             if execution.status == PipelineStatus.CANCELLED.value:
                 raise ValueError(f"Execution {execution_id} was cancelled")
 
+            # 只取当前及之前的步骤（已持有之前输出时只取当前步骤），不加载整条 steps 关系
+            step_filter = (
+                PipelineStep.step_index == step_index if previous_steps is not None
+                else PipelineStep.step_index <= step_index
+            )
+            steps = db.scalars(
+                select(PipelineStep)
+                .where(PipelineStep.pipeline_id == execution_id, step_filter)
+                .order_by(PipelineStep.step_index)
+            )
             current_step = None
-            previous_outputs = {}
-            for step in execution.steps:
+            previous_outputs = dict(previous_steps) if previous_steps is not None else {}
+            for step in steps:
                 if step.step_index == step_index:
                     current_step = step
-                elif step.step_index < step_index and step.output_data:
+                elif step.output_data:
                     previous_outputs[step.step_type] = step.output_data
 
             if not current_step:
                 raise ValueError(f"Step not found: execution={execution_id}, index={step_index}")
 
-            # 标记步骤运行中
+            # 标记步骤运行中（步骤与 execution 的开始时间取同一时刻）
+            now = utcnow()
             current_step.status = StepStatus.RUNNING.value
-            current_step.started_at = utcnow()
+            current_step.started_at = now
 
             # 首个步骤实际执行时, 将 execution 从 PENDING 转为 RUNNING
             if execution.status == PipelineStatus.PENDING.value:
                 execution.status = PipelineStatus.RUNNING.value
-                execution.started_at = utcnow()
+                execution.started_at = now
                 execution.current_step = step_index
 
             step_config = current_step.step_config or {}
 
-            # 读取 content 的 url 供步骤使用
-            from app.models.content import ContentItem
-            content = db.get(ContentItem, execution.content_id)
-
-            db.commit()
-
-            return {
+            # 提交前取值: 提交会使实例过期，之后读属性会为每个对象各触发一次 SELECT
+            context = {
                 "execution_id": execution_id,
                 "content_id": execution.content_id,
                 "source_id": execution.source_id,
                 "template_name": execution.template_name,
-                "content_url": content.url if content else None,
-                "content_title": content.title if content else None,
+                "content_url": content_url,
+                "content_title": content_title,
                 "step_type": current_step.step_type,
                 "step_config": step_config,
                 "previous_steps": previous_outputs,
             }
+            db.commit()
+            return context
 
     def finish_step(
         self,
@@ -89,12 +109,15 @@ class PipelineExecutor:
             下一步的 step_index，或 None（流水线结束/失败）
         """
         with SessionLocal() as db:
-            step = db.query(PipelineStep).filter(
-                PipelineStep.pipeline_id == execution_id,
-                PipelineStep.step_index == step_index,
+            # 步骤与所属 execution 一次 JOIN 取回，省去单独的 db.get 往返
+            row = db.execute(
+                select(PipelineStep, PipelineExecution)
+                .join(PipelineExecution, PipelineExecution.id == PipelineStep.pipeline_id)
+                .where(PipelineStep.pipeline_id == execution_id, PipelineStep.step_index == step_index)
             ).first()
-            if not step:
+            if not row:
                 return None
+            step, execution = row
 
             now = utcnow()
             step.completed_at = now
@@ -104,11 +127,9 @@ class PipelineExecutor:
                 step.error_message = error
                 if step.is_critical:
                     step.status = StepStatus.FAILED.value
-                    execution = db.get(PipelineExecution, execution_id)
-                    if execution:
-                        execution.status = PipelineStatus.FAILED.value
-                        execution.error_message = f"关键步骤 '{step.step_type}' 失败: {error}"
-                        execution.completed_at = now
+                    execution.status = PipelineStatus.FAILED.value
+                    execution.error_message = f"关键步骤 '{step.step_type}' 失败: {error}"
+                    execution.completed_at = now
                     logger.error(f"Pipeline {execution_id} 在关键步骤 {step.step_type} 失败")
                     db.commit()
                     return None  # 关键步骤失败，不推进
@@ -122,8 +143,7 @@ class PipelineExecutor:
                     step.output_data = output_data
 
             # ---- 推进流水线 ----
-            execution = db.get(PipelineExecution, execution_id)
-            if not execution or execution.status in (PipelineStatus.FAILED.value, PipelineStatus.CANCELLED.value):
+            if execution.status in (PipelineStatus.FAILED.value, PipelineStatus.CANCELLED.value):
                 db.commit()
                 return None
 
@@ -137,17 +157,17 @@ class PipelineExecutor:
                 execution.completed_at = now
 
                 # 更新内容状态: template_id 必定存在（无模板不创建流水线）
-                # 保留 else → READY 分支作为防御性编码
-                from app.models.content import ContentItem, ContentStatus
-                content = db.get(ContentItem, execution.content_id)
-                if content:
-                    if execution.template_id:
-                        content.status = ContentStatus.ANALYZED.value
-                    else:
-                        content.status = ContentStatus.READY.value
-
+                # 保留 else → READY 分支作为防御性编码。直接 UPDATE，无需先加载整行 content
+                content_status = ContentStatus.ANALYZED if execution.template_id else ContentStatus.READY
+                db.execute(
+                    update(ContentItem)
+                    .where(ContentItem.id == execution.content_id)
+                    .values(status=content_status.value)
+                )
+
+                template_name = execution.template_name
                 db.commit()
-                logger.info(f"Pipeline {execution_id} ({execution.template_name}) 完成")
+                logger.info(f"Pipeline {execution_id} ({template_name}) 完成")
                 return None
 
             execution.current_step = next_index
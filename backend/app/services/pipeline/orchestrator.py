@@ -2,7 +2,8 @@
 
 流程:
   定时器 → CollectionService.collect(source) → N 条新 ContentItem
-    → 对每条调用 Orchestrator.trigger_for_content(content) → 创建 PipelineExecution
+    → Orchestrator.trigger_for_contents(content_ids) → 批量创建 PipelineExecution
+    （手动触发等单条场景用 trigger_for_content）
 
 流水线不自动预处理:
   - 采集完成后不做预处理，直接保存 ContentItem，状态为 pending
@@ -12,8 +13,12 @@
 
 import logging
 
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
+from app.core.time import utcnow
+
 from app.models.content import SourceConfig, ContentItem, ContentStatus
 from app.models.pipeline import (
     PipelineTemplate, PipelineExecution, PipelineStep,
@@ -23,6 +28,20 @@ from app.models.pipeline import (
 logger = logging.getLogger(__name__)
 
 
+def _step_rows(execution_id: str, all_steps: list[dict]) -> list[dict]:
+    """模板 steps_config → PipelineStep 批量 INSERT 的参数行"""
+    return [
+        {
+            "pipeline_id": execution_id,
+            "step_index": index,
+            "step_type": step_def["step_type"],
+            "step_config": step_def.get("config", {}),
+            "is_critical": step_def.get("is_critical", False),
+        }
+        for index, step_def in enumerate(all_steps)
+    ]
+
+
 class PipelineOrchestrator:
 
     def __init__(self, db: Session):
@@ -34,7 +53,8 @@ class PipelineOrchestrator:
         """获取数据源绑定的流水线模板, 未绑定返回 None"""
         if not source.pipeline_template_id:
             return None
-        template = self.db.query(PipelineTemplate).get(source.pipeline_template_id)
+        # Session.get 先查 identity map，同一会话内已加载的模板不再发 SELECT
+        template = self.db.get(PipelineTemplate, source.pipeline_template_id)
         if template and template.is_active:
             return template
         return None
@@ -60,14 +80,19 @@ class PipelineOrchestrator:
         # 1. 确定模板
         template = None
         if template_override_id:
-            template = self.db.query(PipelineTemplate).get(template_override_id)
+            template = self.db.get(PipelineTemplate, template_override_id)
             if not template:
                 raise ValueError(f"Template not found: {template_override_id}")
         else:
-            source = self.db.query(SourceConfig).get(content.source_id)
-            if not source:
+            # 数据源与其绑定模板一次外连接取回，取代 source、template 两次主键查询
+            row = self.db.execute(
+                select(SourceConfig.id, PipelineTemplate)
+                .outerjoin(PipelineTemplate, PipelineTemplate.id == SourceConfig.pipeline_template_id)
+                .where(SourceConfig.id == content.source_id)
+            ).first()
+            if not row:
                 raise ValueError(f"Source not found: {content.source_id}")
-            template = self.get_template_for_source(source)
+            template = row[1] if row[1] is not None and row[1].is_active else None
 
         if not template:
             # 无模板 → 标记 READY，不创建流水线
@@ -96,16 +121,8 @@ class PipelineOrchestrator:
         self.db.add(execution)
         self.db.flush()
 
-        # 4. 创建步骤实例
-        for index, step_def in enumerate(all_steps):
-            step = PipelineStep(
-                pipeline_id=execution.id,
-                step_index=index,
-                step_type=step_def["step_type"],
-                step_config=step_def.get("config", {}),
-                is_critical=step_def.get("is_critical", False),
-            )
-            self.db.add(step)
+        # 4. 创建步骤实例（一次批量 INSERT，不逐个构造 ORM 对象）
+        self.db.execute(insert(PipelineStep), _step_rows(execution.id, all_steps))
 
         self.db.commit()
         logger.info(
@@ -115,14 +132,105 @@ class PipelineOrchestrator:
         )
         return execution
 
+    def trigger_for_contents(
+        self,
+        content_ids: list[str],
+        trigger: TriggerSource = TriggerSource.SCHEDULED,
+    ) -> list[str]:
+        """trigger_for_content 的批量版本（采集任务 / 补偿任务使用），整批一次提交
+
+        内容只取 id / source_id / status 三列，数据源与模板各一次 IN 查询，
+        READY 标记一次 UPDATE，执行记录与步骤各一次批量 INSERT，
+        取代逐条触发时每条 2 次 SELECT + 1+N 次 INSERT + 1 次提交。
+        数据源不存在的内容跳过（单条版本会抛异常）。
+
+        Returns:
+            新建执行记录的 id 列表
+        """
+        if not content_ids:
+            return []
+
+        rows = self.db.execute(
+            select(ContentItem.id, ContentItem.source_id, ContentItem.status)
+            .where(ContentItem.id.in_(content_ids))
+        ).all()
+
+        # 1. 数据源 → 模板，各一次查询
+        sources = self.db.execute(
+            select(SourceConfig.id, SourceConfig.pipeline_template_id)
+            .where(SourceConfig.id.in_({row.source_id for row in rows}))
+        ).all()
+        template_ids = {s.pipeline_template_id for s in sources if s.pipeline_template_id}
+        templates = {
+            t.id: t
+            for t in self.db.scalars(
+                select(PipelineTemplate).where(PipelineTemplate.id.in_(template_ids))
+            )
+            if t.is_active
+        } if template_ids else {}
+        template_by_source = {s.id: templates.get(s.pipeline_template_id) for s in sources}
+
+        # 2. 构建执行记录（与单条版本相同的 READY 规则）
+        ready_ids = []
+        executions = []
+        steps_by_execution = []
+        for content_id, source_id, status in rows:
+            if source_id not in template_by_source:
+                logger.warning(f"Source not found: {source_id}, skip content {content_id}")
+                continue
+            template = template_by_source[source_id]
+            all_steps = (template.steps_config or []) if template else []
+            if not all_steps:
+                # 无模板 → 仅 PENDING 标记 READY；模板无步骤 → 直接 READY
+                if template or status == ContentStatus.PENDING.value:
+                    ready_ids.append(content_id)
+                continue
+
+            executions.append(PipelineExecution(
+                content_id=content_id,
+                source_id=source_id,
+                template_id=template.id,
+                template_name=template.name,
+                status=PipelineStatus.PENDING.value,
+                total_steps=len(all_steps),
+                trigger_source=trigger.value,
+            ))
+            steps_by_execution.append(all_steps)
+
+        if ready_ids:
+            self.db.execute(
+                update(ContentItem)
+                .where(ContentItem.id.in_(ready_ids))
+                .values(status=ContentStatus.READY.value)
+            )
+
+        # 3. 执行记录一次批量 INSERT（主键为客户端 uuid，flush 后即可用）
+        execution_ids = []
+        if executions:
+            self.db.add_all(executions)
+            self.db.flush()
+
+            # 4. 全部步骤一次批量 INSERT
+            self.db.execute(insert(PipelineStep), [
+                row
+                for execution, all_steps in zip(executions, steps_by_execution)
+                for row in _step_rows(execution.id, all_steps)
+            ])
+            # 提交会使实例过期，提交前取 id
+            execution_ids = [execution.id for execution in executions]
+
+        self.db.commit()
+        if execution_ids:
+            logger.info(f"Pipelines created: {len(execution_ids)} for {len(rows)} contents")
+        return execution_ids
+
     def start_execution(self, execution_id: str) -> None:
         """入队第一个步骤 (同步版本, 仅供 executor.py 同步 worker 线程使用)"""
         execution = self.db.get(PipelineExecution, execution_id)
         if not execution:
             raise ValueError(f"Execution not found: {execution_id}")
 
-        self.db.commit()
-
+        # 只读校验，无需提交: 执行记录已由 trigger_for_content 提交，调用方在此之前自行提交其改动
         logger.info(f"Pipeline queued: {execution_id}")
         from app.tasks.pipeline_tasks import execute_pipeline_step
         from app.tasks.procrastinate_app import sync_defer
@@ -134,48 +242,57 @@ class PipelineOrchestrator:
         if not execution:
             raise ValueError(f"Execution not found: {execution_id}")
 
-        self.db.commit()
-
         logger.info(f"Pipeline queued: {execution_id}")
         from app.tasks.pipeline_tasks import execute_pipeline_step
         from app.tasks.procrastinate_app import async_defer
         await async_defer(execute_pipeline_step, execution_id=execution_id, step_index=0)
 
+    async def async_start_executions(self, execution_ids: list[str]) -> None:
+        """批量入队第一个步骤 (异步版本, 配合 trigger_for_contents), 一次 INSERT 入队全部作业"""
+        if not execution_ids:
+            return
+        from app.tasks.pipeline_tasks import execute_pipeline_step
+        from app.tasks.procrastinate_app import async_batch_defer
+        await async_batch_defer(execute_pipeline_step, [
+            {"execution_id": execution_id, "step_index": 0} for execution_id in execution_ids
+        ])
+        logger.info(f"Pipelines queued: {len(execution_ids)}")
+
 
 def seed_builtin_templates(db: Session) -> None:
     """将内置模板写入数据库 (首次启动时调用), 并更新已有内置模板的步骤配置"""
     from app.services.pipeline.registry import BUILTIN_TEMPLATES
 
-    created = 0
-    updated = 0
-    for tmpl_data in BUILTIN_TEMPLATES:
-        existing = (
-            db.query(PipelineTemplate)
-            .filter(PipelineTemplate.name == tmpl_data["name"])
-            .first()
-        )
-        if not existing:
-            template = PipelineTemplate(
-                name=tmpl_data["name"],
-                description=tmpl_data.get("description", ""),
-                steps_config=tmpl_data["steps_config"],
-                is_builtin=True,
-                is_active=True,
-            )
-            db.add(template)
-            created += 1
-        elif existing.is_builtin and existing.steps_config != tmpl_data["steps_config"]:
-            existing.steps_config = tmpl_data["steps_config"]
-            existing.description = tmpl_data.get("description", existing.description)
-            updated += 1
-
-    db.commit()
-    if created or updated:
-        logger.info(f"Seeded {created} new, updated {updated} builtin pipeline templates")
+    # 内置流水线模板一条 upsert: 缺失的插入；已有的内置模板仅在步骤配置变化时更新
+    # (name 唯一约束兜底并发启动，无需先按名称查询)
+    stmt = pg_insert(PipelineTemplate).values([
+        {
+            "name": tmpl_data["name"],
+            "description": tmpl_data.get("description", ""),
+            "steps_config": tmpl_data["steps_config"],
+            "is_builtin": True,
+            "is_active": True,
+        }
+        for tmpl_data in BUILTIN_TEMPLATES
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["name"],
+        set_={
+            "steps_config": stmt.excluded.steps_config,
+            "description": stmt.excluded.description,
+            "updated_at": utcnow(),
+        },
+        where=PipelineTemplate.is_builtin.is_(True)
+        & PipelineTemplate.steps_config.is_distinct_from(stmt.excluded.steps_config),
+    ).returning(PipelineTemplate.name)
+    seeded = db.scalars(stmt).all()
 
     # Seed builtin prompt templates
     from app.models.prompt_template import PromptTemplate
 
+    # 多进程同时启动时串行化（事务级锁，提交时释放）: Prompt 名称无唯一约束，无法 ON CONFLICT
+    db.execute(select(func.pg_advisory_xact_lock(func.hashtext("seed_builtin_templates"))))
+
     BUILTIN_PROMPTS = [
         {
             "name": "金融数据分析",
@@ -193,14 +310,13 @@ def seed_builtin_templates(db: Session) -> None:
         },
     ]
 
+    existing_prompts = set(db.scalars(
+        select(PromptTemplate.name).where(PromptTemplate.name.in_([pt["name"] for pt in BUILTIN_PROMPTS]))
+    ))
+
     prompt_created = 0
     for pt_data in BUILTIN_PROMPTS:
-        existing = (
-            db.query(PromptTemplate)
-            .filter(PromptTemplate.name == pt_data["name"])
-            .first()
-        )
-        if not existing:
+        if pt_data["name"] not in existing_prompts:
             pt = PromptTemplate(
                 name=pt_data["name"],
                 template_type=pt_data.get("template_type", "custom"),
@@ -212,6 +328,9 @@ def seed_builtin_templates(db: Session) -> None:
             db.add(pt)
             prompt_created += 1
 
+    # 模板与 Prompt 一次提交（同时释放 advisory 锁）
+    db.commit()
+    if seeded:
+        logger.info(f"Seeded or updated {len(seeded)} builtin pipeline templates: {', '.join(seeded)}")
     if prompt_created:
-        db.commit()
         logger.info(f"Seeded {prompt_created} builtin prompt templates")
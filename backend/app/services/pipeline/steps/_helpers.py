@@ -1,44 +1,87 @@
 """Pipeline step shared helpers — async runner & LLM wrappers"""
 
 import asyncio
+import contextlib
+import threading
+import weakref
+
+# 每个 worker 线程一个长期事件循环，跨步骤复用（而非每次 asyncio.run 新建再销毁），
+# 绑定在循环上的连接池（LLM client、共享 httpx client）因此得以跨调用保留。
+# 按线程而非全进程共用一个循环: 步骤协程中仍有同步阻塞调用（如 smtplib），不能拖住其他并发任务
+_thread_local = threading.local()
+
+# 按线程长期循环缓存 LLMAnalyzer（AsyncOpenAI 连接绑定创建时的 loop），配置变更时重建
+_analyzers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, tuple]" = weakref.WeakKeyDictionary()
+
+
+def _thread_loop() -> asyncio.AbstractEventLoop:
+    """返回当前线程的长期事件循环，不存在时惰性创建"""
+    loop = getattr(_thread_local, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = asyncio.new_event_loop()
+        _thread_local.loop = loop
+    return loop
 
 
 def _run_async(coro):
     """Run an async coroutine from sync code.
 
-    Uses asyncio.run() in worker (no running loop).
+    Runs on the calling thread's long-lived loop in the worker (no running loop).
     Falls back to a thread pool when called from FastAPI test endpoint
     (event loop already running).
     """
     try:
         asyncio.get_running_loop()
     except RuntimeError:
-        return asyncio.run(coro)
+        return _thread_loop().run_until_complete(coro)
     # Already inside an event loop (e.g. FastAPI) — run in a new thread to avoid blocking
     import concurrent.futures
     with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
         return pool.submit(asyncio.run, coro).result()
 
 
-async def _llm_chat(messages, response_format=None):
-    """Create LLM client, call chat, close client properly."""
+@contextlib.asynccontextmanager
+async def _analyzer():
+    """提供 LLMAnalyzer
+
+    在当前线程的长期循环上复用缓存的 analyzer（保留 HTTP 连接池），LLM 配置变更后关闭旧 client 并重建；
+    其他循环（FastAPI 回退路径由 asyncio.run 建的临时循环）按调用创建并在结束时关闭，避免泄漏 client
+    """
+    from app.core.config import get_llm_config
     from app.services.analyzers.llm_analyzer import LLMAnalyzer
-    analyzer = LLMAnalyzer()
-    try:
+
+    cfg = get_llm_config()
+    loop = asyncio.get_running_loop()
+    if loop is not getattr(_thread_local, "loop", None):
+        analyzer = LLMAnalyzer(cfg)
+        try:
+            yield analyzer
+        finally:
+            await analyzer.client.close()
+        return
+
+    cached = _analyzers.get(loop)
+    if cached is not None and cached[0] == cfg:
+        yield cached[1]
+        return
+    if cached is not None:
+        await cached[1].client.close()
+    analyzer = LLMAnalyzer(cfg)
+    _analyzers[loop] = (cfg, analyzer)
+    yield analyzer
+
+
+async def _llm_chat(messages, response_format=None):
+    """Call chat via the (cached or per-call) LLM client."""
+    async with _analyzer() as analyzer:
         return await analyzer.client.chat.completions.create(
             model=analyzer.model,
             messages=messages,
             response_format=response_format,
         )
-    finally:
-        await analyzer.client.close()
 
 
 async def _llm_analyze(text, prompt_tpl):
-    """Create LLM analyzer, run analysis, close client properly."""
-    from app.services.analyzers.llm_analyzer import LLMAnalyzer
-    analyzer = LLMAnalyzer()
-    try:
+    """Run analysis via the (cached or per-call) LLM analyzer."""
+    async with _analyzer() as analyzer:
         return await analyzer.analyze(text, prompt_tpl)
-    finally:
-        await analyzer.client.close()
@@ -1,8 +1,10 @@
 """Pipeline step: analyze_content — LLM 分析"""
 
-import json
 import logging
 
+import orjson
+from sqlalchemy import func, select, update
+
 from app.services.pipeline.steps._helpers import _run_async, _llm_chat, _llm_analyze
 
 logger = logging.getLogger(__name__)
@@ -21,21 +23,20 @@ def _handle_analyze_content(context: dict) -> dict:
     from app.models.prompt_template import PromptTemplate
 
     with SessionLocal() as db:
-        content = db.get(ContentItem, content_id)
-        if not content:
+        # 确定输入文本: processed_content → raw_data.summary → raw_data.content[0].value → title，
+        # 在库内按优先级取出单个文本，不加载整行（raw_data / processed_content 可能很大且只用其一）
+        row = db.execute(
+            select(func.coalesce(
+                func.nullif(ContentItem.processed_content, ""),
+                func.nullif(ContentItem.raw_data["summary"].astext, ""),
+                func.nullif(ContentItem.raw_data[("content", 0, "value")].astext, ""),
+                func.nullif(ContentItem.title, ""),
+            )).where(ContentItem.id == content_id)
+        ).first()
+        if not row:
             raise ValueError(f"Content not found: {content_id}")
 
-        # 确定输入文本
-        text = content.processed_content
-        if not text and content.raw_data:
-            raw = content.raw_data
-            text = raw.get("summary", "")
-            if not text:
-                contents = raw.get("content", [])
-                if isinstance(contents, list) and contents:
-                    text = contents[0].get("value", "")
-        if not text:
-            text = content.title or ""
+        text = row[0]
         if not text:
             return {"status": "skipped", "reason": "no text to analyze"}
 
@@ -61,15 +62,17 @@ def _handle_analyze_content(context: dict) -> dict:
             response_format={"type": "json_object"},
         ))
         try:
-            result = json.loads(result.choices[0].message.content)
-        except (json.JSONDecodeError, AttributeError):
+            result = orjson.loads(result.choices[0].message.content)
+        except (orjson.JSONDecodeError, AttributeError):
             result = {"summary": result.choices[0].message.content if hasattr(result, "choices") else str(result)}
 
-    # 写回 analysis_result
+    # 写回 analysis_result: 直接 UPDATE，无需先加载整行（内容已删除时影响 0 行）
     with SessionLocal() as db:
-        content = db.get(ContentItem, content_id)
-        if content:
-            content.analysis_result = result
-            db.commit()
+        db.execute(
+            update(ContentItem)
+            .where(ContentItem.id == content_id)
+            .values(analysis_result=result)
+        )
+        db.commit()
 
     return {"status": "analyzed", "result_keys": list(result.keys()) if isinstance(result, dict) else []}
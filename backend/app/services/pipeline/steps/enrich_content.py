@@ -53,7 +53,7 @@ def _handle_enrich_content(context: dict) -> dict:
 
     import httpx
     from bs4 import BeautifulSoup
-    from app.services.pipeline.steps.extract_content import _extract_raw_text, _strip_html
+    from app.services.pipeline.steps.extract_content import _RAW_TEXT_EXPR, _strip_html
     from app.services.enrichment import (
         _extract_with_trafilatura,
         _detect_anti_scraping,
@@ -63,13 +63,14 @@ def _handle_enrich_content(context: dict) -> dict:
     )
 
     # 1. 提取原始文本（用于对比和回退）
+    from sqlalchemy import select
     from app.core.database import SessionLocal
     from app.models.content import ContentItem
     with SessionLocal() as db:
-        content = db.get(ContentItem, context["content_id"])
-        raw_data_json = content.raw_data if content else None
+        original_html = db.scalar(
+            select(_RAW_TEXT_EXPR).where(ContentItem.id == context["content_id"])
+        ) or ""
 
-    original_html = _extract_raw_text(raw_data_json)
     original_text = _strip_html(original_html) if original_html else ""
 
     enriched_md = ""
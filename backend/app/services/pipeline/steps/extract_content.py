@@ -3,16 +3,21 @@
 import logging
 import re
 
+from sqlalchemy import func
+
 from app.core.database import SessionLocal
 from app.models.content import ContentItem
 
 logger = logging.getLogger(__name__)
 
 
+# 单次扫描: script/style 整块（含其中的 JS/CSS 文本）或任意标签
+_HTML_STRIP_RE = re.compile(r"<(script|style)\b[^>]*>.*?</\1\s*>|<[^>]+>", re.I | re.S)
+
+
 def _strip_html(html: str) -> str:
-    """去除 HTML 标签, 返回纯文本"""
-    text = re.sub(r"<[^>]+>", "", html)
-    return text.strip()
+    """去除 HTML 标签（连同 script/style 内容）, 返回纯文本"""
+    return _HTML_STRIP_RE.sub("", html).strip()
 
 
 def _extract_raw_text(raw_data: dict | None) -> str:
@@ -34,6 +39,15 @@ def _extract_raw_text(raw_data: dict | None) -> str:
     return raw_data.get("summary", "")
 
 
+# 与 _extract_raw_text 同优先级的 SQL 表达式: 在库内按 JSONB 路径取出文本，
+# 只需文本时无需传输并反序列化整个 raw_data（全文 RSS 可达 MB 级）
+_RAW_TEXT_EXPR = func.coalesce(
+    func.nullif(ContentItem.raw_data[("content", 0, "value")].astext, ""),
+    ContentItem.raw_data["summary"].astext,
+    "",
+)
+
+
 def _handle_extract_content(context: dict) -> dict:
     """从 raw_data 提取内容填充 processed_content
 
@@ -56,30 +56,24 @@ async def collect_single_source(source_id: str, trigger: str = "scheduled", use_
             if dedup_count:
                 logger.info(f"[collect_task] {source.name}: {dedup_count} items marked as duplicates")
 
+            # 提交会使新内容过期，提交前取 id，避免触发阶段逐条刷新整行
+            new_item_ids = [item.id for item in new_items]
+
             # 持久化采集成功状态，防止后续 pipeline 触发失败回滚
             db.commit()
 
             # ---- 第二阶段: 对每条新内容触发流水线 ----
             trigger_source = TriggerSource.MANUAL if trigger == "manual" else TriggerSource.SCHEDULED
+            # 整批一次创建并入队（同源共用模板，执行记录 / 步骤 / 作业各一次批量 INSERT）
             orchestrator = PipelineOrchestrator(db)
             pipelines_started = 0
-            for item in new_items:
-                try:
-                    execution = orchestrator.trigger_for_content(
-                        content=item,
-                        trigger=trigger_source,
-                    )
-                    if execution:
-                        await orchestrator.async_start_execution(execution.id)
-                        pipelines_started += 1
-                        logger.info(
-                            f"Pipeline triggered: {item.title} -> {execution.template_name}"
-                        )
-                except Exception as pe:
-                    db.rollback()
-                    logger.error(f"Pipeline trigger failed for {item.title[:50]}: {pe}")
-
-            db.commit()
+            try:
+                execution_ids = orchestrator.trigger_for_contents(new_item_ids, trigger=trigger_source)
+                await orchestrator.async_start_executions(execution_ids)
+                pipelines_started = len(execution_ids)
+            except Exception as pe:
+                db.rollback()
+                logger.error(f"Pipeline trigger failed for {source.name}: {pe}")
             logger.info(
                 f"[collect_task] {source.name}: {len(new_items)} new items, "
                 f"{pipelines_started} pipelines started (trigger={trigger})"
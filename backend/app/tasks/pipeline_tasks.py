@@ -14,6 +14,7 @@ import logging
 
 import procrastinate
 
+from app.core.database import json_deserializer, json_serializer
 from app.tasks.procrastinate_app import proc_app
 import app.models  # noqa: F401 — 确保所有 ORM 模型注册，避免 relationship 解析失败
 from app.services.pipeline.executor import PipelineExecutor
@@ -37,13 +38,16 @@ def execute_pipeline_step(execution_id: str, step_index: int):
     每步仍更新 DB 状态，保留进度可见性和错误追踪。
     """
     current_index = step_index
+    # 之前步骤的输出在循环内累积，后续步骤不再从 DB 读回；首步（含重试 / 恢复入队）由 DB 加载
+    previous_steps = None
 
     while current_index is not None:
         try:
-            context = executor.prepare_step(execution_id, current_index)
+            context = executor.prepare_step(execution_id, current_index, previous_steps)
         except ValueError as e:
             logger.error(str(e))
             return
+        previous_steps = dict(context["previous_steps"])
 
         step_type = context["step_type"]
         logger.info(f"Step [{current_index}] {step_type} starting (pipeline={execution_id})")
@@ -57,6 +61,9 @@ def execute_pipeline_step(execution_id: str, step_index: int):
 
             next_index = executor.finish_step(execution_id, current_index, output_data=result)
             logger.info(f"Step [{current_index}] {step_type} completed (pipeline={execution_id})")
+            if result:
+                # 经 JSONB 同一序列化往返，与从 DB 读回的 output_data 保持一致
+                previous_steps[step_type] = json_deserializer(json_serializer(result))
             current_index = next_index
 
         except Exception as e:
@@ -80,3 +80,21 @@ async def async_defer(task, queueing_lock: str | None = None, **kwargs):
     if queueing_lock:
         config_kwargs["queueing_lock"] = queueing_lock
     return await proc_app.configure_task(task.name, **config_kwargs).defer_async(**kwargs)
+
+
+async def async_batch_defer(task, kwargs_list: list[dict]):
+    """批量提交同一任务的多个作业（异步），一次 INSERT 入队
+
+    供采集后批量启动流水线使用，省去逐条 defer 的往返。
+
+    Args:
+        task: Procrastinate task (decorated function)
+        kwargs_list: 每个作业的参数
+
+    Returns:
+        Job ID 列表
+    """
+    if not kwargs_list:
+        return []
+    queue = task.queue or "default"
+    return await proc_app.configure_task(task.name, queue=queue).batch_defer_async(*kwargs_list)
@@ -90,27 +90,21 @@ async def check_and_collect_sources(timestamp):
         from sqlalchemy import not_, exists
 
         # 限制每次补偿100条，避免1分钟周期下单次查询过多（频率增加5倍）
-        orphaned = db.query(ContentItem).filter(
+        orphaned_ids = [row[0] for row in db.query(ContentItem.id).filter(
             ContentItem.status == ContentStatus.PENDING.value,
             ~exists().where(PipelineExecution.content_id == ContentItem.id),
-        ).limit(100).all()
+        ).limit(100).all()]
 
-        if orphaned:
-            logger.info(f"Compensation: {len(orphaned)} pending items without pipeline")
+        if orphaned_ids:
+            logger.info(f"Compensation: {len(orphaned_ids)} pending items without pipeline")
             orchestrator = PipelineOrchestrator(db)
-            for item in orphaned:
-                try:
-                    execution = orchestrator.trigger_for_content(
-                        content=item,
-                        trigger=TriggerSource.SCHEDULED,
-                    )
-                    if execution:
-                        await orchestrator.async_start_execution(execution.id)
-                        logger.info(f"Compensation pipeline: {item.title[:50]} → {execution.template_name}")
-                except Exception as e:
-                    db.rollback()
-                    logger.error(f"Compensation trigger failed for {item.title[:50]}: {e}")
-            db.commit()
+            try:
+                execution_ids = orchestrator.trigger_for_contents(orphaned_ids, trigger=TriggerSource.SCHEDULED)
+                await orchestrator.async_start_executions(execution_ids)
+                logger.info(f"Compensation pipelines: {len(execution_ids)} started")
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Compensation trigger failed: {e}")
 
         # ---- 恢复: 卡在 running 超时的步骤重新入队 ----
         from app.models.pipeline import PipelineStep, StepStatus, PipelineStatus
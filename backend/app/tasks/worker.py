@@ -0,0 +1,26 @@
+"""Worker 启动入口 — 在 uvloop 事件循环上运行 Procrastinate CLI
+
+`python -m procrastinate` 在 CLI 内部才加载 App，此时事件循环已建好，无法再切换；
+这里先设置 uvloop 策略再进入 CLI（Windows 等未安装 uvloop 时沿用默认事件循环），参数原样透传:
+
+    python -m app.tasks.worker --app=app.tasks.procrastinate_app.proc_app worker --queues=pipeline
+"""
+
+import asyncio
+
+from procrastinate import cli
+
+try:
+    import uvloop
+except ImportError:  # requirements 中 uvloop 不装在 Windows 上
+    uvloop = None
+
+
+def main():
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    cli.main()
+
+
+if __name__ == "__main__":
+    main()
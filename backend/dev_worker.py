@@ -23,7 +23,7 @@ DRAIN_TIMEOUT = 600  # 最多等 10 分钟让当前任务完成
 # 队列配置: name → (queues, concurrency)
 WORKER_PROFILES = {
     "pipeline":  (["pipeline"],  4),
-    "scheduled": (["scheduled"], 2),
+    "scheduled": (["scheduled"], 6),
 }
 
 
@@ -37,6 +37,11 @@ async def main():
     async with proc_app.open_async():
         await proc_app.run_worker_async(queues={queues_arg}, concurrency={concurrency})
 
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
 asyncio.run(main())
 """]
 
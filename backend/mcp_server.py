@@ -30,6 +30,7 @@ from sqlalchemy import create_engine, func
 from sqlalchemy.orm import joinedload, sessionmaker
 
 from app.core.config import settings
+from app.core.database import json_deserializer, json_serializer
 from app.core.time import utcnow
 from app.models.content import (
     ContentItem,
@@ -57,8 +58,11 @@ mcp_engine = create_engine(
     max_overflow=2,
     pool_recycle=3600,
     pool_pre_ping=True,
+    pool_use_lifo=True,
+    json_serializer=json_serializer,
+    json_deserializer=json_deserializer,
 )
-MCPSession = sessionmaker(bind=mcp_engine)
+MCPSession = sessionmaker(bind=mcp_engine, autoflush=False)
 
 _TIME_RANGE_DAYS = {"1d": 1, "3d": 3, "7d": 7, "30d": 30}
 
@@ -588,6 +592,10 @@ def update_source(
 
             for k, v in updates.items():
                 setattr(source, k, v)
+            # 采集地址变更后，旧的条件请求缓存头不再适用
+            if "url" in updates:
+                source.http_etag = None
+                source.http_last_modified = None
             db.commit()
 
             logger.info("MCP update_source: %s (%s)", source.id, source.name)
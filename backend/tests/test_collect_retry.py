@@ -0,0 +1,109 @@
+"""采集层重试单元测试
+
+验证失败尝试中已 flush 的数据在重试前被回滚，不会随后续成功的尝试一并提交
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from sqlalchemy import Column, Integer, String, create_engine, event
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+from app.services.collectors import collect_with_retry
+
+Base = declarative_base()
+
+
+class Item(Base):
+    __tablename__ = "items"
+
+    id = Column(Integer, primary_key=True)
+    title = Column(String, unique=True, nullable=False)
+
+
+class FakeSource:
+    name = "fake"
+
+
+RETRY_CONFIG = {"enabled": True, "max_attempts": 3, "delays": [0]}
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+
+    # pysqlite 默认的事务处理不支持 SAVEPOINT，改为由 SQLAlchemy 显式发 BEGIN
+    @event.listens_for(engine, "connect")
+    def _connect(dbapi_conn, _record):
+        dbapi_conn.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine, autoflush=False)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+class FlakyCollector:
+    """第一次尝试 flush 一条数据后抛出暂时性错误，之后正常采集"""
+
+    def __init__(self):
+        self.attempts = 0
+
+    async def collect(self, source, db):
+        self.attempts += 1
+        if self.attempts == 1:
+            db.add(Item(title="partial"))
+            db.flush()
+            raise httpx.ConnectError("connection reset")
+        item = Item(title="ok")
+        db.add(item)
+        db.flush()
+        return [item]
+
+
+class FailingFlushCollector:
+    """第一次尝试 flush 违反唯一约束（会话进入失败事务状态），之后正常采集"""
+
+    def __init__(self):
+        self.attempts = 0
+
+    async def collect(self, source, db):
+        self.attempts += 1
+        if self.attempts == 1:
+            db.add(Item(title="dup"))
+            db.add(Item(title="dup"))
+            db.flush()
+        item = Item(title="ok")
+        db.add(item)
+        db.flush()
+        return [item]
+
+
+class TestCollectWithRetry:
+    """测试 collect_with_retry 的尝试间隔离"""
+
+    def test_failed_attempt_rows_not_committed(self, db):
+        """失败尝试已 flush 的条目应在重试前回滚"""
+        collector = FlakyCollector()
+        result = asyncio.run(collect_with_retry(collector, FakeSource(), db, RETRY_CONFIG))
+        db.commit()
+
+        assert collector.attempts == 2
+        assert [i.title for i in result] == ["ok"]
+        assert [i.title for i in db.query(Item).all()] == ["ok"]
+
+    def test_failed_flush_does_not_poison_retries(self, db):
+        """flush 失败后的重试不应因 PendingRollbackError 连续失败"""
+        collector = FailingFlushCollector()
+        result = asyncio.run(collect_with_retry(collector, FakeSource(), db, RETRY_CONFIG))
+        db.commit()
+
+        assert collector.attempts == 2
+        assert [i.title for i in result] == ["ok"]
+        assert [i.title for i in db.query(Item).all()] == ["ok"]
@@ -0,0 +1,177 @@
+"""EPUB 解析单元测试
+
+验证 zip 直读路径的元数据、封面、目录提取，以及结构不规范时回退到 ebooklib
+"""
+
+import zipfile
+from unittest.mock import patch
+
+import pytest
+
+from app.services import ebook_parser
+from app.services.ebook_parser import EbookMetadata, parse_epub
+
+CONTAINER_XML = """<?xml version="1.0"?>
+<container version="1.0" xmlns="urn:oasis:names:tc:opendocument:xmlns:container">
+  <rootfiles>
+    <rootfile full-path="OEBPS/content.opf" media-type="application/oebps-package+xml"/>
+  </rootfiles>
+</container>"""
+
+OPF_EPUB2 = """<?xml version="1.0" encoding="utf-8"?>
+<package xmlns="http://www.idpf.org/2007/opf" version="2.0" unique-identifier="id">
+  <metadata xmlns:dc="http://purl.org/dc/elements/1.1/">
+    <dc:identifier id="id">book-1</dc:identifier>
+    <dc:title>测试书</dc:title>
+    <dc:title>副标题</dc:title>
+    <dc:creator>作者甲</dc:creator>
+    <dc:language>zh</dc:language>
+    <dc:publisher>出版社</dc:publisher>
+    <dc:description>简介</dc:description>
+    <meta name="cover" content="cover-img"/>
+  </metadata>
+  <manifest>
+    <item id="ncx" href="toc.ncx" media-type="application/x-dtbncx+xml"/>
+    <item id="ch1" href="text/ch1.xhtml" media-type="application/xhtml+xml"/>
+    <item id="ch2" href="text/ch2.xhtml" media-type="application/xhtml+xml"/>
+    <item id="pic" href="images/pic.png" media-type="image/png"/>
+    <item id="cover-img" href="images/front.jpg" media-type="image/jpeg"/>
+  </manifest>
+  <spine toc="ncx">
+    <itemref idref="ch1"/>
+    <itemref idref="ch2"/>
+  </spine>
+</package>"""
+
+NCX = """<?xml version="1.0" encoding="utf-8"?>
+<ncx xmlns="http://www.daisy.org/z3986/2005/ncx/" version="2005-1">
+  <navMap>
+    <navPoint id="p1">
+      <navLabel><text>第一章</text></navLabel>
+      <content src="text/ch1.xhtml"/>
+      <navPoint id="p1-1">
+        <navLabel><text>第一节</text></navLabel>
+        <content src="text/ch1.xhtml#s1"/>
+      </navPoint>
+    </navPoint>
+    <navPoint id="p2">
+      <navLabel><text>第二章</text></navLabel>
+      <content src="text/ch2.xhtml"/>
+    </navPoint>
+  </navMap>
+</ncx>"""
+
+OPF_EPUB3 = """<?xml version="1.0" encoding="utf-8"?>
+<package xmlns="http://www.idpf.org/2007/opf" version="3.0" unique-identifier="id">
+  <metadata xmlns:dc="http://purl.org/dc/elements/1.1/">
+    <dc:identifier id="id">book-2</dc:identifier>
+    <dc:title>导航书</dc:title>
+  </metadata>
+  <manifest>
+    <item id="nav" href="nav/nav.xhtml" media-type="application/xhtml+xml" properties="nav"/>
+    <item id="ch1" href="text/ch1.xhtml" media-type="application/xhtml+xml"/>
+    <item id="img" href="images/cover.png" media-type="image/png"/>
+  </manifest>
+  <spine>
+    <itemref idref="ch1"/>
+  </spine>
+</package>"""
+
+NAV = """<?xml version="1.0" encoding="utf-8"?>
+<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops">
+<body>
+  <nav epub:type="toc">
+    <ol>
+      <li><a href="../text/ch1.xhtml">第一章</a></li>
+      <li><span>第二部分</span>
+        <ol><li><a href="../text/ch1.xhtml#s2">第二节</a></li></ol>
+      </li>
+    </ol>
+  </nav>
+</body>
+</html>"""
+
+
+def _write_epub(path, files: dict[str, str | bytes]):
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("mimetype", "application/epub+zip")
+        for name, data in files.items():
+            zf.writestr(name, data)
+    return str(path)
+
+
+class TestParseEpubZip:
+    """测试 zip 直读路径"""
+
+    def test_epub2_metadata_cover_ncx(self, tmp_path):
+        """EPUB2: 取各 DC 字段首个值，封面按 meta cover 定位，目录取 NCX"""
+        path = _write_epub(tmp_path / "a.epub", {
+            "META-INF/container.xml": CONTAINER_XML,
+            "OEBPS/content.opf": OPF_EPUB2,
+            "OEBPS/toc.ncx": NCX,
+            "OEBPS/text/ch1.xhtml": "<html/>",
+            "OEBPS/text/ch2.xhtml": "<html/>",
+            "OEBPS/images/pic.png": b"PNGDATA",
+            "OEBPS/images/front.jpg": b"JPEGDATA",
+        })
+        with patch.object(ebook_parser, "_parse_epub_ebooklib") as fallback:
+            meta = parse_epub(path)
+        fallback.assert_not_called()
+
+        assert meta.title == "测试书"
+        assert meta.author == "作者甲"
+        assert meta.language == "zh"
+        assert meta.publisher == "出版社"
+        assert meta.description == "简介"
+        assert (meta.cover_data, meta.cover_ext) == (b"JPEGDATA", "jpg")
+        assert meta.toc_to_list() == [
+            {"title": "第一章", "href": "text/ch1.xhtml", "children": [
+                {"title": "第一节", "href": "text/ch1.xhtml#s1"},
+            ]},
+            {"title": "第二章", "href": "text/ch2.xhtml"},
+        ]
+
+    def test_epub3_nav_toc_and_cover_by_name(self, tmp_path):
+        """EPUB3 无 NCX: 目录取 nav 文档（href 相对 OPF 目录），封面按文件名匹配"""
+        path = _write_epub(tmp_path / "b.epub", {
+            "META-INF/container.xml": CONTAINER_XML,
+            "OEBPS/content.opf": OPF_EPUB3,
+            "OEBPS/nav/nav.xhtml": NAV,
+            "OEBPS/text/ch1.xhtml": "<html/>",
+            "OEBPS/images/cover.png": b"PNGDATA",
+        })
+        meta = parse_epub(path)
+
+        assert meta.title == "导航书"
+        assert meta.author is None
+        assert (meta.cover_data, meta.cover_ext) == (b"PNGDATA", "png")
+        assert meta.toc_to_list() == [
+            {"title": "第一章", "href": "text/ch1.xhtml"},
+            {"title": "第二部分", "children": [
+                {"title": "第二节", "href": "text/ch1.xhtml#s2"},
+            ]},
+        ]
+
+
+class TestParseEpubFallback:
+    """测试结构不规范时回退到 ebooklib"""
+
+    @pytest.mark.parametrize("files", [
+        {"OEBPS/content.opf": OPF_EPUB2},  # 缺 container.xml
+        {"META-INF/container.xml": CONTAINER_XML, "OEBPS/content.opf": "<package"},  # OPF 非法
+    ])
+    def test_malformed_archive_falls_back(self, tmp_path, files):
+        """zip 直读失败时应改用 ebooklib 解析"""
+        path = _write_epub(tmp_path / "bad.epub", files)
+        expected = EbookMetadata(title="回退结果")
+        with patch.object(ebook_parser, "_parse_epub_ebooklib", return_value=expected) as fallback:
+            assert parse_epub(path) is expected
+        fallback.assert_called_once_with(path)
+
+    def test_not_a_zip_falls_back(self, tmp_path):
+        """非 zip 文件同样交给 ebooklib"""
+        path = tmp_path / "broken.epub"
+        path.write_bytes(b"not a zip archive")
+        with patch.object(ebook_parser, "_parse_epub_ebooklib", return_value=EbookMetadata()) as fallback:
+            parse_epub(str(path))
+        fallback.assert_called_once_with(str(path))